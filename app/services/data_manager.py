@@ -29,6 +29,7 @@ class DataManager:
         # Rate limiting
         self.min_request_interval = 0.2  # 200ms between requests
         self.price_cache_timeout = 30    # 30 seconds for price cache
+        self.rate_limited_until = 0.0    # Epoch seconds; set after a Binance 429/418
         
         # Setup requests session with connection pooling
         self._setup_session()
@@ -157,6 +158,34 @@ class DataManager:
             self.logger.error(f"Error fetching price for {symbol}: {e}")
             return None
     
+    def is_rate_limited(self) -> bool:
+        """True while backing off after a Binance 429/418 response"""
+        return time.time() < self.rate_limited_until
+
+    def has_cached_klines(self, symbol: str, interval: str) -> bool:
+        """True if valid klines for symbol/interval are in the memory cache"""
+        cached_data = self.cache.get(f"{symbol}_{interval}")
+        return cached_data is not None and self._is_cache_valid(cached_data, interval)
+
+    def _note_rate_limit(self, error: Exception):
+        """Start a back-off window if the error is a Binance 429 (rate limit) or 418 (IP ban)"""
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+        if status is None and isinstance(error, requests.exceptions.RetryError) and "429" in str(error):
+            # 429 is retried by the session adapter; the final error carries no response
+            status = 429
+        if status not in (418, 429):
+            return
+        
+        retry_after = 60.0
+        if response is not None:
+            try:
+                retry_after = float(response.headers.get("Retry-After", retry_after))
+            except (TypeError, ValueError):
+                pass
+        self.rate_limited_until = max(self.rate_limited_until, time.time() + retry_after)
+        self.logger.warning(f"Binance returned {status}, backing off klines for {retry_after:.0f}s")
+
     def get_klines(self, symbol: str, interval: str, limit: int = 500) -> Optional[pd.DataFrame]:
         """Get klines data with caching"""
         cache_key = f"{symbol}_{interval}"
@@ -167,6 +196,10 @@ class DataManager:
             if self._is_cache_valid(cached_data, interval):
                 return cached_data['df']
         
+        # Don't extend a rate limit or ban; serve the file fallback meanwhile
+        if self.is_rate_limited():
+            return self._load_from_file(symbol, interval)
+        
         try:
             binance_config = self.config.get_binance_config()
             url = f"{binance_config['base_url']}/klines"
@@ -218,6 +251,7 @@ class DataManager:
             
         except Exception as e:
             self.logger.error(f"Error fetching klines for {symbol}: {e}")
+            self._note_rate_limit(e)
             return self._load_from_file(symbol, interval)
     
     def _is_cache_valid(self, cached_data: Dict, interval: str) -> bool:
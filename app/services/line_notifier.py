@@ -2,7 +2,7 @@
 import logging
 import requests
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from linebot import LineBotApi, WebhookHandler
 from linebot.exceptions import InvalidSignatureError, LineBotApiError
@@ -115,6 +115,46 @@ class LineNotifier:
             logger.error(f"Error sending position update: {e}")
             return False
 
+    # LINE push API accepts at most this many messages per request
+    MAX_MESSAGES_PER_PUSH = 5
+
+    def send_position_updates(self, updates: List[Dict]) -> int:
+        """
+        Send several position update notifications in as few pushes as possible
+        
+        Args:
+            updates: Position update data dicts, as for send_position_update
+            
+        Returns:
+            int: Number of updates sent (0 if LINE is not configured)
+            
+        Raises:
+            Exception: The push error, after logging how many updates went out
+                before it; the remaining updates are not sent
+        """
+        if not self.line_bot_api or not self.user_id:
+            logger.warning("LINE not properly configured, cannot send position updates")
+            return 0
+
+        messages = [
+            TextSendMessage(text=self._create_position_update_message(update_data))
+            for update_data in updates
+            if update_data.get("events")
+        ]
+        sent = 0
+        try:
+            for start in range(0, len(messages), self.MAX_MESSAGES_PER_PUSH):
+                batch = messages[start:start + self.MAX_MESSAGES_PER_PUSH]
+                self.line_bot_api.push_message(self.user_id, batch)
+                sent += len(batch)
+        except Exception as e:
+            logger.error(f"Error sending position updates ({sent}/{len(messages)} sent): {e}")
+            raise
+
+        if sent:
+            logger.info(f"Position updates sent: {sent}")
+        return sent
+
     def send_daily_summary(self, summary: Dict) -> bool:
         """
         Send daily trading summary
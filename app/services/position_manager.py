@@ -94,8 +94,14 @@ class PositionManager:
             return None
     
     @ErrorHandler.service_error_handler("PositionManager")
-    def update_positions(self) -> Dict[str, Dict]:
-        """Update all active positions with current prices"""
+    def update_positions(self, prices: Optional[Dict[str, float]] = None) -> Dict[str, Dict]:
+        """
+        Update all active positions with current prices
+
+        Args:
+            prices: Optional symbol -> price map already fetched by the caller;
+                    fetched from DataManager when omitted
+        """
         updates = {}
         
         try:
@@ -106,8 +112,11 @@ class PositionManager:
                 return updates
             
             # Get current prices for all active symbols
-            symbols = list(set([pos['symbol'] for pos in active_positions.values()]))
-            current_prices = self.data_manager.get_current_prices_cached(symbols)
+            if prices is not None:
+                current_prices = prices
+            else:
+                symbols = list(set([pos['symbol'] for pos in active_positions.values()]))
+                current_prices = self.data_manager.get_current_prices_cached(symbols)
             
             for position_id, position in active_positions.items():
                 symbol = position['symbol']
@@ -2,16 +2,113 @@
 
 import json
 import logging
-from datetime import datetime
+import os
+import sys
+import time
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+def _dumps(obj) -> bytes:
+    """Serialize obj to compact JSON bytes (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=str, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(raw: bytes):
+    """Parse JSON bytes (orjson when available)."""
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def _iso_to_epoch_ms(timestamp: str) -> int:
+    """Parse an ISO 8601 timestamp (optionally 'Z'-suffixed) to epoch ms."""
+    parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    return int(parsed.timestamp() * 1000)
+
+
+def _eval_tick(
+    inv_entry: float,
+    entry_price: float,
+    stop_loss: float,
+    take_profits: List[float],
+    tp_order: Tuple[int, ...],
+    hit_mask: int,
+    dir_sign: int,
+    price: float,
+) -> Tuple[float, bool, int]:
+    """
+    Evaluate one price tick against a position's levels.
+
+    Pure arithmetic on plain numbers so it can be reused (or compiled)
+    without touching Position state.
+
+    Args:
+        inv_entry: 1 / entry_price
+        entry_price: Entry price level
+        stop_loss: Stop loss price level
+        take_profits: TP levels in the caller's order
+        tp_order: Indexes into take_profits, nearest level first
+        hit_mask: Bitmask of TP levels already hit
+        dir_sign: 1 for LONG, -1 for SHORT
+        price: Current market price
+
+    Returns:
+        Tuple of (pnl_percent, sl_hit, bitmask of newly hit TP levels)
+    """
+    pnl = dir_sign * (price - entry_price) * inv_entry * 100
+    sl_hit = dir_sign * (price - stop_loss) <= 0
+
+    new_bits = 0
+    if not sl_hit:
+        for i in tp_order:
+            if (hit_mask >> i) & 1:
+                continue
+            # Nearest first: the first unreached level ends the scan
+            if dir_sign * (price - take_profits[i]) < 0:
+                break
+            new_bits |= 1 << i
+
+    return pnl, sl_hit, new_bits
+
+
 class Position:
     """Individual position data structure."""
 
+    __slots__ = (
+        "symbol",
+        "timeframe",
+        "direction",
+        "entry_price",
+        "stop_loss",
+        "take_profits",
+        "timestamp_ms",
+        "status",
+        "hit_mask",
+        "current_pnl",
+        "max_pnl",
+        "min_pnl",
+        "_json_cache",
+        "_dir_sign",
+        "_inv_entry",
+        "_tp_order",
+    )
+
+    # Canonical status strings so equal statuses share one object
+    _STATUS_INTERN: Dict[str, str] = {"ACTIVE": "ACTIVE"}
+
     def __init__(
         self,
         symbol: str,
@@ -31,21 +128,61 @@ class Position:
             direction: 'LONG' or 'SHORT'
             entry_price: Entry price level
             stop_loss: Stop loss price level
-            take_profits: List of take profit levels
+            take_profits: List of take profit levels, TP1 first
             timestamp: Position creation timestamp
         """
-        self.symbol = symbol
-        self.timeframe = timeframe
-        self.direction = direction
+        # Drawn from a tiny universe: intern so instances share the strings
+        self.symbol = sys.intern(symbol)
+        self.timeframe = sys.intern(timeframe)
+        self.direction = sys.intern(direction)
         self.entry_price = entry_price
         self.stop_loss = stop_loss
-        self.take_profits = take_profits
-        self.timestamp = timestamp or datetime.now().isoformat()
-        self.status = "ACTIVE"
-        self.hit_tps = []  # Track which TPs have been hit
+        self.take_profits = list(take_profits)
+        # Epoch milliseconds internally; ISO text only at the JSON boundary
+        self.timestamp_ms = (
+            _iso_to_epoch_ms(timestamp) if timestamp else int(time.time() * 1000)
+        )
+        self.status = self._STATUS_INTERN["ACTIVE"]
+        self.hit_mask = 0  # Bit i set when TP(i+1) has been hit
         self.current_pnl = 0.0
         self.max_pnl = 0.0
         self.min_pnl = 0.0
+        self._json_cache: Optional[bytes] = None  # Serialized to_dict() fragment
+        self._dir_sign = 1 if direction == "LONG" else -1
+        self._inv_entry = 1.0 / entry_price if entry_price else 0.0
+        # TP indexes nearest target first (ascending for LONG, descending for
+        # SHORT); TP labels and hit bits keep the caller's order
+        self._tp_order = tuple(
+            sorted(
+                range(len(self.take_profits)),
+                key=lambda i: self._dir_sign * self.take_profits[i],
+            )
+        )
+        if self._tp_order != tuple(range(len(self.take_profits))):
+            logger.warning(
+                f"{symbol} {timeframe} {direction} take profits {self.take_profits} "
+                f"are not ordered nearest first"
+            )
+
+    def set_status(self, status: str) -> None:
+        """Set status using the canonical instance of the status string."""
+        self.status = self._STATUS_INTERN.setdefault(status, status)
+        self._json_cache = None
+
+    @property
+    def timestamp(self) -> str:
+        """Position creation time as an ISO 8601 UTC string (with offset)."""
+        return datetime.fromtimestamp(
+            self.timestamp_ms / 1000, tz=timezone.utc
+        ).isoformat()
+
+    @property
+    def hit_tps(self) -> List[str]:
+        """TP keys that have been hit, e.g. ['TP1', 'TP2']."""
+        mask = self.hit_mask
+        return [
+            f"TP{i}" for i in range(1, mask.bit_length() + 1) if (mask >> (i - 1)) & 1
+        ]
 
     def to_dict(self) -> Dict:
         """Convert position to dictionary."""
@@ -64,6 +201,16 @@ class Position:
             "min_pnl": self.min_pnl,
         }
 
+    def to_json(self) -> bytes:
+        """Serialized position, cached until the position changes."""
+        if self._json_cache is None:
+            self._json_cache = _dumps(self.to_dict())
+        return self._json_cache
+
+    def invalidate(self) -> None:
+        """Drop the cached JSON fragment after a mutation."""
+        self._json_cache = None
+
     @classmethod
     def from_dict(cls, data: Dict):
         """Create position from dictionary."""
@@ -76,8 +223,9 @@ class Position:
             take_profits=data["take_profits"],
             timestamp=data["timestamp"],
         )
-        position.status = data.get("status", "ACTIVE")
-        position.hit_tps = data.get("hit_tps", [])
+        position.set_status(data.get("status", "ACTIVE"))
+        for tp_key in data.get("hit_tps", []):
+            position.hit_mask |= 1 << (int(tp_key[2:]) - 1)
         position.current_pnl = data.get("current_pnl", 0.0)
         position.max_pnl = data.get("max_pnl", 0.0)
         position.min_pnl = data.get("min_pnl", 0.0)
@@ -85,30 +233,50 @@ class Position:
 
     def update_pnl(self, current_price: float) -> float:
         """Update P&L based on current price."""
-        if self.direction == "LONG":
-            pnl_percent = ((current_price - self.entry_price) / self.entry_price) * 100
-        else:  # SHORT
-            pnl_percent = ((self.entry_price - current_price) / self.entry_price) * 100
+        pnl_percent = (
+            self._dir_sign * (current_price - self.entry_price) * self._inv_entry * 100
+        )
+        self.record_pnl(pnl_percent)
+        return pnl_percent
 
+    def record_pnl(self, pnl_percent: float) -> None:
+        """Store an already computed P&L percentage."""
         self.current_pnl = pnl_percent
         self.max_pnl = max(self.max_pnl, pnl_percent)
         self.min_pnl = min(self.min_pnl, pnl_percent)
-
-        return pnl_percent
+        self._json_cache = None
 
 
 class PositionTracker:
     """Track active positions and manage entry/exit logic."""
 
+    # Compact the write-ahead log into a snapshot after this many records
+    # or this many seconds, whichever comes first
+    WAL_COMPACT_RECORDS = 1000
+    WAL_COMPACT_SECONDS = 60
+
     def __init__(self, positions_file: str = "data/positions.json"):
         """
         Initialize position tracker.
 
+        Positions are persisted as a JSON snapshot (positions_file) plus an
+        append-only write-ahead log next to it (positions.wal). Mutations
+        append one line to the log; the snapshot is rewritten on compaction.
+
         Args:
             positions_file: Path to JSON file for storing positions
         """
         self.positions_file = Path(positions_file)
-        self.positions: Dict[str, Position] = {}
+        self.wal_file = self.positions_file.with_suffix(".wal")
+        # Keyed by (symbol, timeframe); the "SYMBOL_TF" string form is only
+        # used in the positions file
+        self.positions: Dict[Tuple[str, str], Position] = {}
+
+        self._wal_fp = None
+        self._wal_records = 0
+        # P&L-only changes are not logged; they ride along with the next snapshot
+        self._pnl_dirty = False
+        self._last_snapshot = time.monotonic()
 
         # Ensure data directory exists
         self.positions_file.parent.mkdir(parents=True, exist_ok=True)
@@ -117,32 +285,117 @@ class PositionTracker:
         self.load_positions()
 
     def load_positions(self) -> None:
-        """Load positions from file."""
+        """Load positions from the snapshot, then replay the write-ahead log."""
         try:
             if self.positions_file.exists():
-                with open(self.positions_file, "r") as f:
-                    data = json.load(f)
+                with open(self.positions_file, "rb") as f:
+                    data = _loads(f.read())
 
-                for key, pos_data in data.items():
-                    self.positions[key] = Position.from_dict(pos_data)
+                for pos_data in data.values():
+                    position = Position.from_dict(pos_data)
+                    self.positions[(position.symbol, position.timeframe)] = position
 
                 logger.info(f"Loaded {len(self.positions)} positions from file")
             else:
                 logger.info("No existing positions file found, starting fresh")
 
+            replayed = self._replay_wal()
+            if replayed:
+                logger.info(f"Replayed {replayed} position log records")
+
         except Exception as e:
             logger.error(f"Error loading positions: {e}")
             self.positions = {}
 
+    def _replay_wal(self) -> int:
+        """Apply write-ahead log records on top of the loaded snapshot."""
+        if not self.wal_file.exists():
+            return 0
+
+        replayed = 0
+        with open(self.wal_file, "rb") as f:
+            for line in f:
+                try:
+                    record = _loads(line)
+                except ValueError:
+                    # Torn trailing line from a crash mid-append
+                    logger.warning("Ignoring incomplete position log record")
+                    break
+
+                if record["op"] == "put":
+                    position = Position.from_dict(record["v"])
+                    self.positions[(position.symbol, position.timeframe)] = position
+                elif record["op"] == "del":
+                    symbol, _, timeframe = record["k"].rpartition("_")
+                    self.positions.pop((symbol, timeframe), None)
+                replayed += 1
+
+        self._wal_records = replayed
+        return replayed
+
+    def _append_wal(self, record: bytes) -> None:
+        """Append one record to the write-ahead log, compacting when due."""
+        try:
+            if self._wal_fp is None:
+                self._wal_fp = open(self.wal_file, "ab")
+            self._wal_fp.write(record)
+            self._wal_fp.flush()
+            self._wal_records += 1
+            self._maybe_snapshot()
+
+        except Exception as e:
+            logger.error(f"Error appending position log: {e}")
+
+    def _maybe_snapshot(self) -> None:
+        """Write a snapshot once the log or pending P&L changes are due."""
+        if self._wal_records >= self.WAL_COMPACT_RECORDS or (
+            (self._wal_records or self._pnl_dirty)
+            and time.monotonic() - self._last_snapshot >= self.WAL_COMPACT_SECONDS
+        ):
+            self.save_positions()
+
+    def _log_put(self, key: Tuple[str, str]) -> None:
+        """Log the current state of one position."""
+        self._append_wal(
+            b'{"op":"put","k":'
+            + _dumps(self.get_position_key(*key))
+            + b',"v":'
+            + self.positions[key].to_json()
+            + b"}\n"
+        )
+
+    def _log_del(self, key: Tuple[str, str]) -> None:
+        """Log the removal of one position."""
+        self._append_wal(
+            b'{"op":"del","k":' + _dumps(self.get_position_key(*key)) + b"}\n"
+        )
+
     def save_positions(self) -> None:
-        """Save positions to file."""
+        """Write a full snapshot atomically and truncate the write-ahead log."""
         try:
-            data = {}
+            # Only positions changed since the last save are re-serialized
+            parts = [b"{"]
             for key, position in self.positions.items():
-                data[key] = position.to_dict()
-
-            with open(self.positions_file, "w") as f:
-                json.dump(data, f, indent=2, default=str)
+                if len(parts) > 1:
+                    parts.append(b",")
+                parts += (_dumps(self.get_position_key(*key)), b":", position.to_json())
+            parts.append(b"}")
+
+            tmp_file = self.positions_file.with_suffix(".tmp")
+            with open(tmp_file, "wb") as f:
+                f.write(b"".join(parts))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.positions_file)
+
+            # Snapshot is durable; the log records it covers can go
+            if self._wal_fp is not None:
+                self._wal_fp.close()
+                self._wal_fp = None
+            open(self.wal_file, "wb").close()
+            self._wal_records = 0
+            self._pnl_dirty = False
+            self._last_snapshot = time.monotonic()
 
             logger.debug(f"Saved {len(self.positions)} positions to file")
 
@@ -150,18 +403,17 @@ class PositionTracker:
             logger.error(f"Error saving positions: {e}")
 
     def get_position_key(self, symbol: str, timeframe: str) -> str:
-        """Generate unique key for position."""
+        """Generate the persisted (file) key for a position."""
         return f"{symbol}_{timeframe}"
 
     def has_active_position(self, symbol: str, timeframe: str) -> bool:
         """Check if there's an active position for symbol/timeframe."""
-        key = self.get_position_key(symbol, timeframe)
-        return key in self.positions and self.positions[key].status == "ACTIVE"
+        position = self.positions.get((symbol, timeframe))
+        return position is not None and position.status == "ACTIVE"
 
     def get_position(self, symbol: str, timeframe: str) -> Optional[Position]:
         """Get position for symbol/timeframe."""
-        key = self.get_position_key(symbol, timeframe)
-        return self.positions.get(key)
+        return self.positions.get((symbol, timeframe))
 
     def create_position(
         self,
@@ -185,7 +437,7 @@ class PositionTracker:
             Created Position object
         """
         try:
-            key = self.get_position_key(symbol, timeframe)
+            key = (symbol, timeframe)
 
             # Close any existing position first
             if key in self.positions:
@@ -210,7 +462,7 @@ class PositionTracker:
             )
 
             self.positions[key] = position
-            self.save_positions()
+            self._log_put(key)
 
             logger.info(
                 f"Created {direction} position for {symbol} {timeframe} at {entry_price}"
@@ -236,15 +488,15 @@ class PositionTracker:
             Closed Position object or None if not found
         """
         try:
-            key = self.get_position_key(symbol, timeframe)
+            key = (symbol, timeframe)
 
             if key in self.positions:
                 position = self.positions[key]
-                position.status = f"CLOSED_{reason}"
+                position.set_status(f"CLOSED_{reason}")
 
                 # Remove from active positions
                 del self.positions[key]
-                self.save_positions()
+                self._log_del(key)
 
                 logger.info(
                     f"Closed {position.direction} position for {symbol} {timeframe} - {reason}"
@@ -273,7 +525,7 @@ class PositionTracker:
             Dict with tracking results and any triggered levels
         """
         try:
-            key = self.get_position_key(symbol, timeframe)
+            key = (symbol, timeframe)
 
             if key not in self.positions:
                 return {"status": "NO_POSITION"}
@@ -283,8 +535,17 @@ class PositionTracker:
             if position.status != "ACTIVE":
                 return {"status": "INACTIVE_POSITION"}
 
-            # Update P&L
-            pnl_percent = position.update_pnl(current_price)
+            pnl_percent, sl_hit, new_bits = _eval_tick(
+                position._inv_entry,
+                position.entry_price,
+                position.stop_loss,
+                position.take_profits,
+                position._tp_order,
+                position.hit_mask,
+                position._dir_sign,
+                current_price,
+            )
+            position.record_pnl(pnl_percent)
 
             result = {
                 "status": "TRACKING",
@@ -298,12 +559,6 @@ class PositionTracker:
             }
 
             # ✅ Check for Stop Loss hit FIRST
-            sl_hit = False
-            if position.direction == "LONG":
-                sl_hit = current_price <= position.stop_loss
-            else:  # SHORT
-                sl_hit = current_price >= position.stop_loss
-            
             if sl_hit:
                 self.close_position(symbol, timeframe, "SL")
                 result["triggered_levels"].append(
@@ -314,61 +569,38 @@ class PositionTracker:
                 return result
 
             # 🎯 FIXED: Check ALL TP levels simultaneously
-            new_tp_hits = []  # เก็บ TP ที่ hit ใหม่ในรอบนี้
-            
-            for i, tp_price in enumerate(position.take_profits, 1):
-                tp_key = f"TP{i}"
-                
-                # ตรวจสอบว่า TP นี้ hit แล้วหรือยัง
-                if tp_key not in position.hit_tps:
-                    tp_hit = False
-                    
-                    if position.direction == "LONG":
-                        tp_hit = current_price >= tp_price
-                    else:  # SHORT
-                        tp_hit = current_price <= tp_price
-                    
-                    if tp_hit:
-                        new_tp_hits.append({
-                            "key": tp_key,
-                            "price": tp_price,
-                            "level": i
-                        })
-
-            # 📝 Process new TP hits in order
-            if new_tp_hits:
-                # เรียงตามระดับ (TP1, TP2, TP3)
-                new_tp_hits.sort(key=lambda x: x["level"])
-                
-                for tp_hit in new_tp_hits:
-                    tp_key = tp_hit["key"]
-                    tp_price = tp_hit["price"]
-                    
-                    # เพิ่มใน hit_tps
-                    position.hit_tps.append(tp_key)
-                    
-                    # เพิ่มใน result
+            # Apply every new hit at once; levels are reported in TP order
+            if new_bits:
+                position.hit_mask |= new_bits
+                position.invalidate()
+
+                for i, tp_price in enumerate(position.take_profits, 1):
+                    if not (new_bits >> (i - 1)) & 1:
+                        continue
+
+                    tp_key = f"TP{i}"
                     result["triggered_levels"].append({
                         "type": tp_key,
                         "price": tp_price,
                         "pnl_percent": pnl_percent,
                     })
-                    
-                    logger.info(f"🎯 {symbol} {tp_key} HIT at {current_price} (target: {tp_price})")
 
-            # 🔄 เรียงลำดับ hit_tps ให้ถูกต้อง
-            if position.hit_tps:
-                position.hit_tps.sort(key=lambda x: int(x[2:]))
+                    logger.info(f"🎯 {symbol} {tp_key} HIT at {current_price} (target: {tp_price})")
 
             # ✅ Close position on TP3 hit
-            if "TP3" in position.hit_tps:
+            if position.hit_mask & 0b100:
                 self.close_position(symbol, timeframe, "TP3")
                 result["final_pnl"] = pnl_percent
                 logger.info(f"🏁 {symbol} position CLOSED on TP3")
 
-            # 💾 Save updated position
+            # 💾 Log only structural changes; P&L is kept in memory until
+            # the next snapshot
             if position.status == "ACTIVE":
-                self.save_positions()
+                if new_bits:
+                    self._log_put(key)
+                else:
+                    self._pnl_dirty = True
+                    self._maybe_snapshot()
 
             return result
 
@@ -376,13 +608,82 @@ class PositionTracker:
             logger.error(f"❌ Error updating position tracking: {e}")
             return {"status": "ERROR", "error": str(e)}
 
+    def update_all_positions(self, prices: Dict[str, float]) -> Dict[str, Dict]:
+        """
+        Batch P&L and TP/SL evaluation for every active position.
+
+        All active positions with a price are evaluated with a handful of
+        NumPy operations; only rows that actually hit SL or a new TP go
+        through update_position_tracking for closing, logging and results.
+
+        Args:
+            prices: Mapping of symbol to current market price
+
+        Returns:
+            Dict mapping (symbol, timeframe) to tracking result for positions with
+            triggered levels
+        """
+        results = {}
+
+        try:
+            rows = [
+                (key, position)
+                for key, position in self.positions.items()
+                if position.status == "ACTIVE" and position.symbol in prices
+            ]
+            if not rows:
+                return results
+
+            n = len(rows)
+            width = max(len(position.take_profits) for _, position in rows)
+
+            price = np.empty(n)
+            entry = np.empty(n)
+            inv_entry = np.empty(n)
+            sl = np.empty(n)
+            dir_sign = np.empty(n)
+            tp = np.full((n, width), np.nan)
+            hit_mask = np.zeros((n, width), dtype=bool)
+
+            for row, (_, position) in enumerate(rows):
+                price[row] = prices[position.symbol]
+                entry[row] = position.entry_price
+                inv_entry[row] = position._inv_entry
+                sl[row] = position.stop_loss
+                dir_sign[row] = position._dir_sign
+                tp[row, : len(position.take_profits)] = position.take_profits
+                for level in range(width):
+                    hit_mask[row, level] = (position.hit_mask >> level) & 1
+
+            # Same operation order as _eval_tick, so both paths agree exactly
+            pnl = dir_sign * (price - entry) * inv_entry * 100
+            sl_hit = dir_sign * (price - sl) <= 0
+            tp_hit = (dir_sign[:, None] * (price[:, None] - tp) >= 0) & ~hit_mask
+            triggered = sl_hit | tp_hit.any(axis=1)
+
+            for row, (key, position) in enumerate(rows):
+                if triggered[row]:
+                    results[key] = self.update_position_tracking(
+                        position.symbol, position.timeframe, float(price[row])
+                    )
+                else:
+                    position.record_pnl(float(pnl[row]))
+                    self._pnl_dirty = True
+
+            self._maybe_snapshot()
+            return results
+
+        except Exception as e:
+            logger.error(f"❌ Error in batch position update: {e}")
+            return results
+
     def get_position_status(self, symbol: str, timeframe: str) -> Dict:
         """
         🔍 NEW: Get detailed status of specific position
         ใช้สำหรับ debug และตรวจสอบ TP levels
         """
         try:
-            key = self.get_position_key(symbol, timeframe)
+            key = (symbol, timeframe)
             
             if key not in self.positions:
                 return {"status": "NO_POSITION", "symbol": symbol, "timeframe": timeframe}
@@ -432,24 +733,21 @@ class PositionTracker:
                 "tp_analysis": {}
             }
             
+            hit_op = "≥" if position._dir_sign > 0 else "≤"
+
             # วิเคราะห์แต่ละ TP level
             for i, tp_price in enumerate(position.take_profits, 1):
                 tp_key = f"TP{i}"
-                already_hit = tp_key in position.hit_tps
-                
-                if position.direction == "LONG":
-                    should_hit = current_price >= tp_price
-                    distance = current_price - tp_price
-                else:  # SHORT
-                    should_hit = current_price <= tp_price
-                    distance = tp_price - current_price
+                already_hit = bool((position.hit_mask >> (i - 1)) & 1)
                 
+                distance = position._dir_sign * (current_price - tp_price)
+
                 result["tp_analysis"][tp_key] = {
                     "target_price": tp_price,
                     "already_hit": already_hit,
-                    "should_hit_now": should_hit,
+                    "should_hit_now": distance >= 0,
                     "price_distance": distance,
-                    "hit_condition": f"current_price {'≥' if position.direction == 'LONG' else '≤'} {tp_price}"
+                    "hit_condition": f"current_price {hit_op} {tp_price}"
                 }
             
             return result
@@ -509,18 +807,12 @@ class PositionTracker:
             Number of positions cleaned up
         """
         try:
-            from datetime import datetime, timedelta
-
-            cutoff_date = datetime.now() - timedelta(days=days)
-            positions_to_remove = []
-
-            for key, position in self.positions.items():
-                if position.status != "ACTIVE":
-                    pos_date = datetime.fromisoformat(
-                        position.timestamp.replace("Z", "+00:00")
-                    )
-                    if pos_date < cutoff_date:
-                        positions_to_remove.append(key)
+            cutoff_ms = int((time.time() - days * 86400) * 1000)
+            positions_to_remove = [
+                key
+                for key, position in self.positions.items()
+                if position.status != "ACTIVE" and position.timestamp_ms < cutoff_ms
+            ]
 
             for key in positions_to_remove:
                 del self.positions[key]
@@ -1,25 +1,78 @@
 """Price data fetching service from Binance API."""
 
+import json
 import logging
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_json(response: requests.Response):
+    """Decode a buffered response body with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+_INTERVAL_UNIT_SECONDS = {"m": 60, "h": 3600, "d": 86400, "w": 604800, "M": 2592000}
+
+
+def _interval_seconds(interval: str) -> int:
+    """Length of a Binance interval string ('15m', '4h', '1d') in seconds."""
+    try:
+        return int(interval[:-1]) * _INTERVAL_UNIT_SECONDS[interval[-1]]
+    except (KeyError, ValueError):
+        return 3600
+
+
 class PriceFetcher:
     """Price data fetching from Binance API."""
 
+    # Concurrent kline requests in get_multiple_symbols (Binance weight limits)
+    MAX_CONCURRENT_REQUESTS = 8
+
+    # In-process response caches
+    MAX_CACHE_ENTRIES = 128
+    PRICE_CACHE_TTL = 1.0  # seconds
+
     def __init__(self, base_url: str = "https://api.binance.com/api/v3"):
         """Initialize price fetcher."""
         self.base_url = base_url
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "SqueezeBot/1.0"})
 
+        # Keep one pooled connection per concurrent worker
+        adapter = HTTPAdapter(
+            pool_connections=self.MAX_CONCURRENT_REQUESTS,
+            pool_maxsize=self.MAX_CONCURRENT_REQUESTS,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # (symbol, interval, limit) -> (monotonic fetch time, DataFrame)
+        self._klines_cache: OrderedDict = OrderedDict()
+        # symbol -> (monotonic fetch time, price)
+        self._price_cache: OrderedDict = OrderedDict()
+        # Guards both caches (get_multiple_symbols fetches on worker threads)
+        self._cache_lock = threading.Lock()
+
     def get_klines(
         self, symbol: str, interval: str = "1h", limit: int = 100
     ) -> Optional[pd.DataFrame]:
@@ -34,60 +87,59 @@ class PriceFetcher:
         Returns:
             DataFrame with OHLCV data or None if error
         """
+        limit = min(limit, 1000)  # Binance max limit
+        cache_key = (symbol.upper(), interval, limit)
+        interval_seconds = _interval_seconds(interval)
+
+        # Serve repeated requests within a tenth of a candle from memory;
+        # callers get their own copy so they cannot alter the cached frame
+        with self._cache_lock:
+            cached = self._klines_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < interval_seconds / 10:
+                self._klines_cache.move_to_end(cache_key)
+                return cached[1].copy()
+
         try:
             url = f"{self.base_url}/klines"
             params = {
-                "symbol": symbol.upper(),
+                "symbol": cache_key[0],
                 "interval": interval,
-                "limit": min(limit, 1000),  # Binance max limit
+                "limit": limit,
             }
 
             logger.debug(f"Fetching {symbol} data for {interval}")
             response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
 
-            data = response.json()
+            data = _parse_json(response)
 
             if not data:
                 logger.warning(f"No data received for {symbol}")
                 return None
 
-            # Convert to DataFrame
-            df = pd.DataFrame(
-                data,
-                columns=[
-                    "timestamp",
-                    "open",
-                    "high",
-                    "low",
-                    "close",
-                    "volume",
-                    "close_time",
-                    "quote_asset_volume",
-                    "number_of_trades",
-                    "taker_buy_base_asset_volume",
-                    "taker_buy_quote_asset_volume",
-                    "ignore",
-                ],
+            # Parse straight into typed arrays; Binance returns candles in
+            # ascending open-time order, so no sort/reindex is needed.
+            raw = np.asarray(data, dtype=object)
+            timestamps = raw[:, 0].astype(np.int64)
+            ohlcv = raw[:, 1:6].astype(np.float64)
+
+            result_df = pd.DataFrame(
+                {
+                    "datetime": pd.to_datetime(timestamps, unit="ms"),
+                    "open": ohlcv[:, 0],
+                    "high": ohlcv[:, 1],
+                    "low": ohlcv[:, 2],
+                    "close": ohlcv[:, 3],
+                    "volume": ohlcv[:, 4],
+                }
             )
 
-            # Convert data types
-            df["datetime"] = pd.to_datetime(df["timestamp"], unit="ms")
-            numeric_columns = ["open", "high", "low", "close", "volume"]
-
-            for col in numeric_columns:
-                df[col] = pd.to_numeric(df[col], errors="coerce")
-
-            # Select and reorder relevant columns
-            result_df = df[
-                ["datetime", "open", "high", "low", "close", "volume"]
-            ].copy()
-            result_df = result_df.sort_values("datetime").reset_index(drop=True)
+            self._store_klines(cache_key, result_df)
 
             logger.info(
                 f"Successfully fetched {len(result_df)} records for {symbol} {interval}"
             )
-            return result_df
+            return result_df.copy()
 
         except requests.exceptions.Timeout:
             logger.error(f"Timeout fetching data for {symbol}")
@@ -102,6 +154,33 @@ class PriceFetcher:
             logger.error(f"Unexpected error fetching {symbol}: {e}")
             return None
 
+    def _store_klines(self, cache_key: Tuple[str, str, int], df: pd.DataFrame) -> None:
+        """Cache a klines frame, evicting stale and least recently used entries."""
+        now = time.monotonic()
+        with self._cache_lock:
+            self._klines_cache[cache_key] = (now, df)
+            self._klines_cache.move_to_end(cache_key)
+
+            stale = [
+                key
+                for key, (fetched, _) in self._klines_cache.items()
+                if now - fetched >= _interval_seconds(key[1])
+            ]
+            for key in stale:
+                del self._klines_cache[key]
+
+            while len(self._klines_cache) > self.MAX_CACHE_ENTRIES:
+                self._klines_cache.popitem(last=False)
+
+    def _store_price(self, symbol: str, price: float) -> None:
+        """Cache a ticker price, evicting least recently used symbols."""
+        with self._cache_lock:
+            self._price_cache[symbol] = (time.monotonic(), price)
+            self._price_cache.move_to_end(symbol)
+
+            while len(self._price_cache) > self.MAX_CACHE_ENTRIES:
+                self._price_cache.popitem(last=False)
+
     def get_current_price(self, symbol: str) -> Optional[float]:
         """
         Get current price for a symbol.
@@ -112,15 +191,23 @@ class PriceFetcher:
         Returns:
             Current price as float or None if error
         """
+        symbol = symbol.upper()
+        with self._cache_lock:
+            cached = self._price_cache.get(symbol)
+            if cached and time.monotonic() - cached[0] < self.PRICE_CACHE_TTL:
+                self._price_cache.move_to_end(symbol)
+                return cached[1]
+
         try:
             url = f"{self.base_url}/ticker/price"
-            params = {"symbol": symbol.upper()}
+            params = {"symbol": symbol}
 
             response = self.session.get(url, params=params, timeout=5)
             response.raise_for_status()
 
-            data = response.json()
+            data = _parse_json(response)
             price = float(data["price"])
+            self._store_price(symbol, price)
 
             logger.debug(f"Current price for {symbol}: {price}")
             return price
@@ -129,6 +216,40 @@ class PriceFetcher:
             logger.error(f"Error fetching current price for {symbol}: {e}")
             return None
 
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Get current prices for many symbols in a single request.
+
+        Args:
+            symbols: List of trading pairs
+
+        Returns:
+            Dict mapping symbol to current price (missing on error)
+        """
+        if not symbols:
+            return {}
+
+        try:
+            url = f"{self.base_url}/ticker/price"
+            params = {
+                "symbols": json.dumps(
+                    [symbol.upper() for symbol in symbols], separators=(",", ":")
+                )
+            }
+
+            response = self.session.get(url, params=params, timeout=5)
+            response.raise_for_status()
+
+            data = _parse_json(response)
+            prices = {item["symbol"]: float(item["price"]) for item in data}
+
+            logger.debug(f"Fetched current prices for {len(prices)} symbols")
+            return prices
+
+        except Exception as e:
+            logger.error(f"Error fetching current prices for {symbols}: {e}")
+            return {}
+
     def get_multiple_symbols(
         self, symbols: List[str], interval: str = "1h", limit: int = 100
     ) -> Dict[str, pd.DataFrame]:
@@ -146,17 +267,30 @@ class PriceFetcher:
         results = {}
         failed_symbols = []
 
-        for symbol in symbols:
-            logger.info(f"Fetching data for {symbol}")
-
+        if not symbols:
+            return results
+
+        # Fetch concurrently over the pooled session; the worker count bounds
+        # in-flight requests instead of sleeping between symbols.
+        workers = min(self.MAX_CONCURRENT_REQUESTS, len(symbols))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="klines"
+        ) as executor:
+            frames = executor.map(
+                lambda symbol: self.get_klines(symbol, interval, limit), symbols
+            )
+            for symbol, df in zip(symbols, frames):
+                if df is not None:
+                    results[symbol] = df
+                else:
+                    failed_symbols.append(symbol)
+
+        # Retry failures once, sequentially
+        for symbol in list(failed_symbols):
             df = self.get_klines(symbol, interval, limit)
             if df is not None:
                 results[symbol] = df
-            else:
-                failed_symbols.append(symbol)
-
-            # Rate limiting - avoid hitting Binance limits
-            time.sleep(0.1)
+                failed_symbols.remove(symbol)
 
         if failed_symbols:
             logger.warning(f"Failed to fetch data for symbols: {failed_symbols}")
@@ -198,16 +332,14 @@ class PriceFetcher:
             logger.error("Found NaN values in price data")
             return False
 
-        # Check for logical price relationships
-        invalid_candles = (
-            (df["high"] < df["low"])
-            | (df["high"] < df["open"])
-            | (df["high"] < df["close"])
-            | (df["low"] > df["open"])
-            | (df["low"] > df["close"])
-        )
+        # Check for logical price relationships on the raw float arrays;
+        # high < low is the cheapest and most common failure, test it first
+        o = df["open"].to_numpy()
+        h = df["high"].to_numpy()
+        l = df["low"].to_numpy()
+        c = df["close"].to_numpy()
 
-        if invalid_candles.any():
+        if np.any(h < l) or np.any((h < o) | (h < c) | (l > o) | (l > c)):
             logger.error("Found invalid price relationships in data")
             return False
 
@@ -231,7 +363,7 @@ class PriceFetcher:
             response = self.session.get(url, params=params, timeout=5)
             response.raise_for_status()
 
-            data = response.json()
+            data = _parse_json(response)
 
             # Extract relevant information
             market_info = {
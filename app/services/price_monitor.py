@@ -3,14 +3,45 @@ Price Monitor - REFACTORED for v2.0
 Simplified coordinator that delegates position tracking to PositionManager
 """
 
+import itertools
+import json
 import logging
+import os
+import queue
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, fields
 from datetime import datetime
 from typing import Dict, List, Optional
-from threading import Thread, Lock
+from threading import Event, Lock, Thread
 
 logger = logging.getLogger(__name__)
 
+# (level, update key) pairs reported by PositionManager.update_positions()
+TP_KEYS = (("TP1", "TP1_hit"), ("TP2", "TP2_hit"), ("TP3", "TP3_hit"))
+_HIT_KEYS = tuple(key for _, key in TP_KEYS) + ("sl_hit",)
+
+
+def _has_loggable_event(update_info: Dict) -> bool:
+    """Whether an update carries a TP/SL hit or closure worth logging to sheets"""
+    for key in _HIT_KEYS:
+        hit_info = update_info.get(key)
+        if hit_info is not None and hit_info.get("hit"):
+            return True
+    return bool(update_info.get("position_closed"))
+
+
+@dataclass(slots=True)
+class MonitorStats:
+    """Monitoring counters; attribute updates instead of dict lookups"""
+    monitoring_cycles: int = 0
+    positions_updated: int = 0
+    tp_hits_logged: int = 0
+    sl_hits_logged: int = 0
+    last_check_epoch: Optional[float] = None  # Rendered as ISO only on read
+    errors: int = 0
+    dropped: int = 0
+
 
 class PriceMonitor:
     """
@@ -27,6 +58,26 @@ class PriceMonitor:
     - Price fetching (delegated to DataManager)
     """
 
+    # Sheets bundling: flush when this many events are queued or this long
+    # after the first one arrived, whichever comes first
+    SHEETS_QUEUE_SIZE = 1000
+    SHEETS_BATCH_SIZE = 500
+    SHEETS_FLUSH_DELAY = 1.0
+
+    # Positions summary is shared by the loop and status endpoints for this long
+    SUMMARY_CACHE_TTL = 1.0
+
+    # Adaptive cadence: back off up to this multiple of update_interval while
+    # idle; after a cycle with hits, poll at half the interval (not below 5s)
+    IDLE_BACKOFF_MAX = 5
+    ACTIVE_MIN_INTERVAL = 5
+
+    # Error backoff: 1s, 2s, 4s ... capped here
+    ERROR_BACKOFF_MAX = 300
+
+    # Stats and logged hits are checkpointed to disk every this many cycles
+    CHECKPOINT_EVERY = 20
+
     def __init__(self, config: Dict, sheets_logger=None):
         """
         Initialize simplified Price Monitor coordinator
@@ -38,29 +89,58 @@ class PriceMonitor:
         self.config = config
         self.sheets_logger = sheets_logger
         
-        # Monitoring control
-        self.monitoring = False
+        # Monitoring control: set = stopped; waits on it wake immediately on stop
+        self._stop = Event()
+        self._stop.set()
         self.monitor_thread = None
-        self.monitor_lock = Lock()
+        self._idle_streak = 0
+        self._err_streak = 0
+
+        # (monotonic timestamp, summary) from PositionManager
+        self._summary_cache = (0.0, None)
+
+        # Sheets events are queued here and written by a background flusher
+        self._sheet_queue = queue.Queue(maxsize=self.SHEETS_QUEUE_SIZE)
+        self._sheets_thread = None
+        self._sheets_stop = Event()
+        # Single worker keeps batches in order; the flusher collects the next
+        # batch while the previous one is still being written. Created when
+        # the flusher starts, so monitoring can be restarted after shutdown()
+        self._sheets_pool: Optional[ThreadPoolExecutor] = None
         
         # Configuration
         self.update_interval = config.get("PRICE_MONITOR_INTERVAL", 30)
+        self.price_cache_ttl = config.get("PRICE_CACHE_TTL", 0.5)
+
+        # symbol -> (monotonic timestamp, price); collapses bursts of lookups
+        self._price_cache: Dict[str, tuple] = {}
+        self._price_cache_lock = Lock()
         
         # Statistics
-        self.stats = {
-            "monitoring_cycles": 0,
-            "positions_updated": 0,
-            "tp_hits_logged": 0,
-            "sl_hits_logged": 0,
-            "last_check": None,
-            "errors": 0
-        }
+        self.stats = MonitorStats()
+        self._cycles = itertools.count(1)
+        # Guards counters bumped from the loop, force checks and the sheets worker
+        self._stats_lock = Lock()
+
+        # (position_id, level) pairs already sent to sheets; restored from the
+        # checkpoint so a restart does not re-log earlier hits
+        self._checkpoint_path = config.get("MONITOR_CHECKPOINT", "data/monitor_state.json")
+        self._logged_hits = set()
+        # Guards _logged_hits: changed by the loop, force checks and the
+        # sheets worker, copied for checkpoints
+        self._hits_lock = Lock()
+        self._load_checkpoint()
         
         # Services (will be injected)
         self.position_manager = None
         self.data_manager = None
         
-        logger.info(f"PriceMonitor v2.0 initialized as coordinator (interval: {self.update_interval}s)")
+        logger.info("PriceMonitor v2.0 initialized as coordinator (interval: %ss)", self.update_interval)
+
+    @property
+    def monitoring(self) -> bool:
+        """Whether the monitoring coordinator is running"""
+        return not self._stop.is_set()
 
     def set_services(self, position_manager=None, data_manager=None):
         """
@@ -74,6 +154,15 @@ class PriceMonitor:
         self.data_manager = data_manager
         logger.info("Services injected into PriceMonitor")
 
+    def _cached_summary(self) -> Dict:
+        """PositionManager summary, reused for SUMMARY_CACHE_TTL seconds"""
+        ts, summary = self._summary_cache
+        now = time.monotonic()
+        if summary is None or now - ts >= self.SUMMARY_CACHE_TTL:
+            summary = self.position_manager.get_positions_summary()
+            self._summary_cache = (now, summary)
+        return summary
+
     def start_monitoring(self):
         """Start the monitoring coordinator"""
         if self.monitoring:
@@ -84,13 +173,14 @@ class PriceMonitor:
             logger.error("Cannot start monitoring: No PositionManager available")
             return
             
-        self.monitoring = True
+        self._stop.clear()
         self.monitor_thread = Thread(
             target=self._monitoring_loop,
             daemon=True,
             name="PriceMonitorCoordinator"
         )
         self.monitor_thread.start()
+        self._start_sheets_flusher()
         
         logger.info("PriceMonitor coordinator started")
 
@@ -99,14 +189,58 @@ class PriceMonitor:
         if not self.monitoring:
             return
             
-        self.monitoring = False
+        self._stop.set()
         
         if self.monitor_thread and self.monitor_thread.is_alive():
             logger.info("Stopping price monitor coordinator...")
             self.monitor_thread.join(timeout=15)
+
+        self._stop_sheets_flusher()
+        self._save_checkpoint()
             
         logger.info("Price monitor coordinator stopped")
 
+    def _load_checkpoint(self):
+        """Restore statistics and logged hits from the checkpoint file"""
+        try:
+            if not os.path.exists(self._checkpoint_path):
+                return
+
+            with open(self._checkpoint_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+
+            self._logged_hits = {tuple(hit) for hit in state.get("last_hits", [])}
+
+            saved = state.get("stats", {})
+            counters = {
+                field.name: saved[field.name]
+                for field in fields(MonitorStats)
+                if field.name != "last_check_epoch" and field.name in saved
+            }
+            self.stats = MonitorStats(**counters)
+            self._cycles = itertools.count(self.stats.monitoring_cycles + 1)
+
+            logger.info("Restored monitor checkpoint (%s logged hits)", len(self._logged_hits))
+
+        except Exception as e:
+            logger.error("Error loading monitor checkpoint: %s", e)
+
+    def _save_checkpoint(self):
+        """Write statistics and logged hits to the checkpoint file atomically"""
+        try:
+            with self._hits_lock:
+                last_hits = sorted(self._logged_hits)
+            state = {"stats": self._stats_dict(), "last_hits": last_hits}
+
+            os.makedirs(os.path.dirname(self._checkpoint_path) or ".", exist_ok=True)
+            tmp_path = f"{self._checkpoint_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self._checkpoint_path)
+
+        except Exception as e:
+            logger.error("Error saving monitor checkpoint: %s", e)
+
     def _monitoring_loop(self):
         """
         Main monitoring loop - simplified coordinator
@@ -118,102 +252,258 @@ class PriceMonitor:
         """
         logger.info("PriceMonitor coordinator loop started")
         
-        while self.monitoring:
+        # Loop-invariant references, bound once
+        stop = self._stop
+        pm = self.position_manager
+        interval = self.update_interval
+        idle_cap = interval * self.IDLE_BACKOFF_MAX
+        fast_interval = max(interval / 2, min(interval, self.ACTIVE_MIN_INTERVAL))
+        self._idle_streak = 0
+        self._err_streak = 0
+
+        while not stop.is_set():
             try:
-                self.stats["last_check"] = datetime.now().isoformat()
-                self.stats["monitoring_cycles"] += 1
+                stats = self.stats  # rebound each cycle: reset_stats() replaces it
+                stats.last_check_epoch = time.time()
+                stats.monitoring_cycles = next(self._cycles)
+                if stats.monitoring_cycles % self.CHECKPOINT_EVERY == 0:
+                    self._save_checkpoint()
                 
                 # Check if we have services available
-                if not self.position_manager:
+                if not pm:
                     logger.warning("No PositionManager available, skipping cycle")
-                    time.sleep(self.update_interval)
+                    stop.wait(interval)
                     continue
                 
                 # Get active positions count
-                summary = self.position_manager.get_positions_summary()
+                summary = self._cached_summary()
                 active_count = summary.get("active_positions", 0)
                 
                 if active_count == 0:
                     logger.debug("No active positions to monitor")
-                    time.sleep(self.update_interval)
+                    self._err_streak = 0
+                    stop.wait(min(interval * 2 ** self._idle_streak, idle_cap))
+                    self._idle_streak += 1
                     continue
+
+                self._idle_streak = 0
                 
-                logger.info(f"Monitoring {active_count} active positions")
+                logger.info("Monitoring %s active positions", active_count)
                 
+                # One batch price request for every active symbol, shared with
+                # PositionManager and the single-symbol price cache
+                prices = self._fetch_active_prices(pm)
+
                 # Trigger PositionManager to update all positions
-                updates = self.position_manager.update_positions()
-                self.stats["positions_updated"] += len(updates)
+                updates = pm.update_positions(prices=prices)
+                self._incr("positions_updated", len(updates))
+                if updates:
+                    self._summary_cache = (0.0, None)
                 
                 # Process updates and log to sheets if available
                 if updates and self.sheets_logger:
                     self._process_updates_for_sheets(updates)
                 
                 # Log summary
-                if updates:
-                    logger.info(f"Processed {len(updates)} position updates")
+                if updates and logger.isEnabledFor(logging.INFO):
+                    logger.info("Processed %s position updates", len(updates))
                     for position_id, update_info in updates.items():
                         if update_info.get('position_closed'):
-                            logger.info(f"Position closed: {position_id}")
-                        elif any(key.endswith('_hit') for key in update_info.keys()):
-                            tp_hits = [k for k in update_info.keys() if k.endswith('_hit') and k.startswith('TP')]
-                            if tp_hits:
-                                logger.info(f"TP hit: {position_id} - {tp_hits}")
+                            logger.info("Position closed: %s", position_id)
+                            continue
+                        tp_hits = [k for k in update_info if k.startswith('TP') and k.endswith('_hit')]
+                        if tp_hits:
+                            logger.info("TP hit: %s - %s", position_id, tp_hits)
                 
-                # Sleep until next cycle
-                time.sleep(self.update_interval)
+                # Sleep until next cycle (returns early on stop); poll faster
+                # while levels are being hit
+                hits = any(_has_loggable_event(info) for info in updates.values())
+                self._err_streak = 0
+                stop.wait(fast_interval if hits else interval)
                 
             except Exception as e:
-                logger.error(f"Error in monitoring loop: {e}")
-                self.stats["errors"] += 1
-                time.sleep(30)  # Wait 30 seconds on error
+                self._incr("errors")
+                # Retry quickly after a single glitch, back off during outages
+                delay = min(2 ** self._err_streak, self.ERROR_BACKOFF_MAX)
+                self._err_streak += 1
+                if self._err_streak > 3:
+                    logger.error("Error in monitoring loop (retry in %ss): %s", delay, e)
+                else:
+                    logger.warning("Error in monitoring loop (retry in %ss): %s", delay, e)
+                stop.wait(delay)
 
     def _process_updates_for_sheets(self, updates: Dict):
         """
-        Process position updates for Google Sheets logging
+        Queue position updates for Google Sheets logging
+
+        Events are written in batches by the sheets flusher thread, so the
+        monitoring loop never waits on Sheets API round-trips. Errors are
+        caught per position; callers bracket the call as a whole.
         
         Args:
             updates: Dictionary of position updates from PositionManager
         """
-        try:
-            if not self.sheets_logger:
-                return
-                
-            for position_id, update_info in updates.items():
-                # Get the position data
-                position_data = self.position_manager.positions.get(position_id)
-                if not position_data:
-                    continue
+        if not self.sheets_logger:
+            return
+
+        # Most updates are plain price refreshes; skip them up front
+        loggable = [
+            (position_id, update_info)
+            for position_id, update_info in updates.items()
+            if _has_loggable_event(update_info)
+        ]
+        if not loggable:
+            return
+
+        self._start_sheets_flusher()
+
+        positions = self.position_manager.positions
+        enqueue = self._enqueue_sheet_event
+        logged_hits = self._logged_hits
+            
+        # Held for the whole pass (enqueueing never blocks) so checkpoints
+        # and the sheets worker see a consistent set
+        with self._hits_lock:
+            for position_id, update_info in loggable:
+                phase = "lookup"
+                try:
+                    # Get the position data
+                    position_data = positions.get(position_id)
+                    if not position_data:
+                        continue
                 
-                # Log TP hits
-                for tp_level in ['TP1', 'TP2', 'TP3']:
-                    tp_key = f'{tp_level}_hit'
-                    if update_info.get(tp_key, {}).get('hit', False):
-                        try:
-                            self.sheets_logger.log_tp_hit(position_data, update_info[tp_key])
-                            self.stats["tp_hits_logged"] += 1
-                            logger.info(f"Logged {tp_level} hit for {position_id}")
-                        except Exception as e:
-                            logger.error(f"Error logging {tp_level} hit: {e}")
+                    # Queue TP hits not already logged (before a restart, too)
+                    phase = "tp"
+                    for tp_level, tp_key in TP_KEYS:
+                        hit_info = update_info.get(tp_key)
+                        if hit_info is not None and hit_info.get('hit'):
+                            hit_key = (position_id, tp_level)
+                            if hit_key in logged_hits:
+                                continue
+                            logged_hits.add(hit_key)
+                            enqueue(("tp", position_data, dict(hit_info, level=tp_level)))
+                            logger.info("Queued %s hit for %s", tp_level, position_id)
                 
-                # Log SL hits
-                if update_info.get('sl_hit', {}).get('hit', False):
-                    try:
-                        self.sheets_logger.log_sl_hit(position_data, update_info['sl_hit'])
-                        self.stats["sl_hits_logged"] += 1
-                        logger.info(f"Logged SL hit for {position_id}")
-                    except Exception as e:
-                        logger.error(f"Error logging SL hit: {e}")
+                    # Queue SL hits
+                    phase = "sl"
+                    sl_info = update_info.get('sl_hit')
+                    if sl_info is not None and sl_info.get('hit') and (position_id, "SL") not in logged_hits:
+                        logged_hits.add((position_id, "SL"))
+                        enqueue(("sl", position_data, dict(sl_info, level="SL")))
+                        logger.info("Queued SL hit for %s", position_id)
                 
-                # Log position closure
-                if update_info.get('position_closed', False):
-                    try:
-                        self.sheets_logger.log_position_close(position_data)
-                        logger.info(f"Logged position closure for {position_id}")
-                    except Exception as e:
-                        logger.error(f"Error logging position closure: {e}")
-                        
-        except Exception as e:
-            logger.error(f"Error processing updates for sheets: {e}")
+                    # Queue position closure
+                    phase = "close"
+                    if update_info.get('position_closed', False):
+                        enqueue(("close", position_data, None))
+                        logger.info("Queued position closure for %s", position_id)
+                        # Position ids are reused when the same setup reopens
+                        for hit_key in [k for k in logged_hits if k[0] == position_id]:
+                            logged_hits.discard(hit_key)
+
+                except Exception as e:
+                    logger.error("Error queueing sheets update (%s/%s): %s", position_id, phase, e)
+                    self._incr("errors")
+
+    def _enqueue_sheet_event(self, event: tuple):
+        """Queue a sheets event, dropping the oldest one when the queue is full"""
+        while True:
+            try:
+                self._sheet_queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self._sheet_queue.get_nowait()
+                    self._incr("dropped")
+                    logger.warning("Sheets queue full, dropped oldest event")
+                except queue.Empty:
+                    pass
+
+    def _start_sheets_flusher(self):
+        """Start the sheets flusher thread if it is not running"""
+        if not self.sheets_logger:
+            return
+        if self._sheets_thread and self._sheets_thread.is_alive():
+            return
+
+        if self._sheets_pool is None:
+            self._sheets_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheets")
+
+        self._sheets_stop.clear()
+        self._sheets_thread = Thread(
+            target=self._sheets_flusher,
+            daemon=True,
+            name="PriceMonitorSheetsFlusher"
+        )
+        self._sheets_thread.start()
+
+    def _stop_sheets_flusher(self):
+        """Stop the sheets flusher after it has drained the queue"""
+        self._sheets_stop.set()
+        if self._sheets_thread and self._sheets_thread.is_alive():
+            self._sheets_thread.join(timeout=15)
+
+    def _sheets_flusher(self):
+        """Drain queued events and write them to Sheets in batches"""
+        pending = self._sheet_queue
+        pool = self._sheets_pool
+
+        while not (self._sheets_stop.is_set() and pending.empty()):
+            try:
+                batch = [pending.get(timeout=self.SHEETS_FLUSH_DELAY)]
+            except queue.Empty:
+                continue
+
+            deadline = time.monotonic() + self.SHEETS_FLUSH_DELAY
+            while len(batch) < self.SHEETS_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                future = pool.submit(self.sheets_logger.batch_log_events, batch)
+            except RuntimeError:  # Pool already shut down
+                logger.warning("Sheets pool closed, discarding %s events", len(batch))
+                break
+            future.add_done_callback(lambda f, batch=batch: self._on_sheet_result(f, batch))
+
+    def _on_sheet_result(self, future: Future, batch: List[tuple]):
+        """Record the outcome of one written batch of sheets events"""
+        error = future.exception()
+        if error:
+            logger.error("Error flushing sheets events: %s", error)
+            self._incr("errors")
+            # Let a re-reported hit be queued again
+            with self._hits_lock:
+                for kind, position_data, info in batch:
+                    if info is not None:
+                        self._logged_hits.discard((position_data.get("id"), info.get("level")))
+            return
+
+        for kind, _, _ in batch:
+            if kind == "tp":
+                self._incr("tp_hits_logged")
+            elif kind == "sl":
+                self._incr("sl_hits_logged")
+        logger.info("Flushed %s sheets events", len(batch))
+
+    def _incr(self, name: str, n: int = 1):
+        """Add to a statistics counter from any thread"""
+        with self._stats_lock:
+            stats = self.stats
+            setattr(stats, name, getattr(stats, name) + n)
+
+    def _stats_dict(self) -> Dict:
+        """Statistics as a plain dict with last_check as ISO text"""
+        with self._stats_lock:
+            stats = asdict(self.stats)
+        epoch = stats.pop("last_check_epoch")
+        stats["last_check"] = datetime.fromtimestamp(epoch).isoformat() if epoch else None
+        return stats
 
     def get_monitoring_status(self) -> Dict:
         """Get current monitoring status"""
@@ -226,18 +516,18 @@ class PriceMonitor:
                 "position_manager": self.position_manager is not None,
                 "data_manager": self.data_manager is not None
             },
-            "stats": self.stats.copy(),
+            "stats": self._stats_dict(),
             "version": "2.0-refactored"
         }
         
         # Add position summary if available
         if self.position_manager:
             try:
-                summary = self.position_manager.get_positions_summary()
+                summary = self._cached_summary()
                 status["positions_count"] = summary.get("active_positions", 0)
                 status["total_positions"] = summary.get("total_positions", 0)
             except Exception as e:
-                logger.error(f"Error getting position summary: {e}")
+                logger.error("Error getting position summary: %s", e)
                 status["positions_count"] = 0
                 status["total_positions"] = 0
         
@@ -261,6 +551,8 @@ class PriceMonitor:
             
             # Trigger immediate update
             updates = self.position_manager.update_positions()
+            if updates:
+                self._summary_cache = (0.0, None)
             
             # Process any updates for sheets
             if updates and self.sheets_logger:
@@ -277,7 +569,7 @@ class PriceMonitor:
             }
             
         except Exception as e:
-            logger.error(f"Error in force check: {e}")
+            logger.error("Error in force check: %s", e)
             return {
                 "status": "error",
                 "error": str(e),
@@ -298,7 +590,7 @@ class PriceMonitor:
             if not self.data_manager:
                 return {"error": "No DataManager available"}
             
-            price = self.data_manager.get_single_price(symbol.upper())
+            price = self._fetch_price(symbol.upper())
             
             if price is not None:
                 return {
@@ -316,13 +608,46 @@ class PriceMonitor:
                 }
                 
         except Exception as e:
-            logger.error(f"Error getting price for {symbol}: {e}")
+            logger.error("Error getting price for %s: %s", symbol, e)
             return {
                 "status": "error",
                 "error": str(e),
                 "symbol": symbol.upper()
             }
 
+    def _fetch_active_prices(self, pm) -> Optional[Dict[str, float]]:
+        """
+        Batch-fetch prices for all active position symbols via DataManager
+
+        Returns None when no DataManager is injected, letting PositionManager
+        fetch prices itself.
+        """
+        if not self.data_manager:
+            return None
+
+        symbols = list({position['symbol'] for position in pm.get_active_positions().values()})
+        prices = self.data_manager.get_current_prices_cached(symbols)
+
+        now = time.monotonic()
+        with self._price_cache_lock:
+            for symbol, price in prices.items():
+                self._price_cache[symbol] = (now, price)
+        return prices
+
+    def _fetch_price(self, symbol: str) -> Optional[float]:
+        """Single-symbol price via DataManager, cached for price_cache_ttl seconds"""
+        now = time.monotonic()
+        with self._price_cache_lock:
+            cached = self._price_cache.get(symbol)
+        if cached and now - cached[0] < self.price_cache_ttl:
+            return cached[1]
+
+        price = self.data_manager.get_single_price(symbol)
+        if price is not None:
+            with self._price_cache_lock:
+                self._price_cache[symbol] = (time.monotonic(), price)
+        return price
+
     # Legacy compatibility methods
     def get_current_price(self, symbol: str) -> Optional[float]:
         """
@@ -331,40 +656,35 @@ class PriceMonitor:
         """
         try:
             if self.data_manager:
-                return self.data_manager.get_single_price(symbol)
+                return self._fetch_price(symbol)
             else:
                 logger.warning("No DataManager available for price fetch")
                 return None
         except Exception as e:
-            logger.error(f"Error getting current price for {symbol}: {e}")
+            logger.error("Error getting current price for %s: %s", symbol, e)
             return None
 
     def get_stats(self) -> Dict:
         """Get monitoring statistics"""
-        stats = self.stats.copy()
+        stats = self._stats_dict()
         stats["version"] = "2.0-refactored"
         stats["monitoring_active"] = self.monitoring
         
         if self.position_manager:
             try:
-                summary = self.position_manager.get_positions_summary()
+                summary = self._cached_summary()
                 stats["current_active_positions"] = summary.get("active_positions", 0)
                 stats["total_positions"] = summary.get("total_positions", 0)
             except Exception as e:
-                logger.error(f"Error getting position stats: {e}")
+                logger.error("Error getting position stats: %s", e)
         
         return stats
 
     def reset_stats(self):
         """Reset monitoring statistics"""
-        self.stats = {
-            "monitoring_cycles": 0,
-            "positions_updated": 0,
-            "tp_hits_logged": 0,
-            "sl_hits_logged": 0,
-            "last_check": None,
-            "errors": 0
-        }
+        with self._stats_lock:
+            self.stats = MonitorStats()
+            self._cycles = itertools.count(1)
         logger.info("Monitoring statistics reset")
 
     def shutdown(self):
@@ -372,9 +692,14 @@ class PriceMonitor:
         try:
             logger.info("Shutting down PriceMonitor v2.0...")
             self.stop_monitoring()
+            # Drain queued events even if only force checks produced them
+            self._stop_sheets_flusher()
+            if self._sheets_pool is not None:
+                self._sheets_pool.shutdown(wait=True)
+                self._sheets_pool = None
             logger.info("PriceMonitor shutdown complete")
         except Exception as e:
-            logger.error(f"Error during PriceMonitor shutdown: {e}")
+            logger.error("Error during PriceMonitor shutdown: %s", e)
 
     # Removed methods that are now handled by PositionManager:
     # - get_active_positions_from_sheets() -> PositionManager handles positions
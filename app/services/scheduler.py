@@ -2,15 +2,33 @@
 Auto Scheduler for Signal Detection and Notification - REFACTORED for v2.0
 Simplified to use refactored services architecture
 """
+import atexit
 import json
 import logging
 import os
-from datetime import datetime, timedelta
-from typing import Dict, List
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Tuple
 from config.settings import Config
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    redis = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,6 +48,31 @@ class SignalScheduler:
     - SheetsLogger (via ConfigManager)
     """
 
+    # Shared read-only default for missing nested dicts (never mutated)
+    _EMPTY: Dict = {}
+
+    # Signal flag -> trade direction, checked in order (buy wins over short)
+    _DIRECTIONS = (("buy", "LONG"), ("short", "SHORT"))
+
+    # Recorded signals between full history snapshots (each one is appended
+    # to the history log in the meantime)
+    HISTORY_SNAPSHOT_EVERY = 50
+
+    # Hard cap on signal history entries on top of the 24-hour expiry; far
+    # above symbols x timeframes x directions, so live cooldowns never drop
+    MAX_SIGNAL_HISTORY = 2000
+
+    # Position summary reuse window shared by daily summary and status probes
+    POSITION_SUMMARY_TTL = 5.0
+
+    # Position update key -> event label, in notification order
+    _HIT_EVENTS = (
+        ("TP1_hit", "TP1 hit"),
+        ("TP2_hit", "TP2 hit"),
+        ("TP3_hit", "TP3 hit"),
+        ("sl_hit", "SL hit"),
+    )
+
     def __init__(self, config: Dict):
         """
         Initialize scheduler with refactored architecture
@@ -37,11 +80,28 @@ class SignalScheduler:
         Args:
             config: Configuration dictionary from ConfigManager
         """
+        # APScheduler is imported here so importing this module stays light
+        from apscheduler.executors.pool import ThreadPoolExecutor as JobExecutor
+        from apscheduler.schedulers.background import BackgroundScheduler
+
         # Basic configuration
         self.config = config
-        self.scheduler = BackgroundScheduler()
+        # One instance per job; late runs coalesce into one and still fire
+        # within 30s of their slot instead of being skipped after 1s
+        self.scheduler = BackgroundScheduler(
+            executors={"default": JobExecutor(4)},
+            job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": 30},
+        )
         self.running = False
         
+        # Network-bound LINE/Sheets calls run here instead of on the job thread
+        self._io_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="sig-io")
+        # Single sender for position update batches so they go out in tick order
+        self._notify_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sig-notify")
+        # Single Sheets writer: journal appends and TP/SL row updates read the
+        # whole sheet and write rows back, so they must not overlap
+        self._sheets_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sig-sheets")
+        
         # Services (will be injected)
         self.signal_detector = None
         self.position_manager = None
@@ -49,99 +109,347 @@ class SignalScheduler:
         self.sheets_logger = None
         
         # Signal deduplication system
-        self.last_signals = {}  # Store signal history
+        self.last_signals = {}  # Store signal history: key -> epoch seconds
+        self._history_order = deque()  # (timestamp, key), oldest first, for expiry
         self.cooldown_minutes = Config.SIGNAL_COOLDOWN_MINUTES
+        self.cooldown_seconds = self.cooldown_minutes * 60
+        self.record_unfilled_signals = getattr(Config, 'RECORD_UNFILLED_SIGNALS', False)
+
+        # Symbols to scan, resolved once
+        self._symbols = tuple(getattr(Config, 'DEFAULT_SYMBOLS', ("BTCUSDT", "ETHUSDT")))
         self.signal_history_file = "data/signal_history.json"
+        self._signal_history_dir = os.path.dirname(self.signal_history_file)
+        # Created once here rather than on every save
+        os.makedirs(self._signal_history_dir, exist_ok=True)
+        self._history_dirty = False  # Flushed to file by the history_flush job
+        self._history_fp = None  # Append handle for the history log, opened on first record
+        self._dirty_count = 0  # Records appended to the log since the last snapshot
+        self._snapshot_readable = False  # Snapshot on disk parsed or written by us (safe to back up)
+        # Serializes log appends with snapshots so a snapshot never truncates
+        # a record it does not contain (scan jobs and the flush job run concurrently)
+        self._history_lock = threading.RLock()
+        self._pos_summary_cache = (0.0, None)  # (monotonic time, summary)
+        self._scan_inflight = set()  # Timeframes currently being scanned
+        self._scan_lock = threading.Lock()
+        
+        # Shared dedup store when REDIS_URL is configured; file history otherwise
+        self._redis = self._connect_redis()
         
         # Load signal history from file
         self._load_signal_history()
         
         logger.info(f"SignalScheduler v2.0 initialized with {self.cooldown_minutes}min cooldown")
 
+    def _connect_redis(self):
+        """Redis client for cross-replica signal dedup, or None"""
+        redis_url = getattr(Config, 'REDIS_URL', '')
+        if not redis_url:
+            return None
+        if not REDIS_AVAILABLE:
+            logger.warning("REDIS_URL set but redis is not installed - using local signal history")
+            return None
+        try:
+            client = redis.Redis.from_url(redis_url, decode_responses=False, socket_timeout=2)
+            logger.info("Signal dedup shared via Redis")
+            return client
+        except Exception as e:
+            logger.error(f"Error connecting to Redis, using local signal history: {e}")
+            return None
+
     def _load_signal_history(self):
-        """Load signal history from file"""
+        """Load signal history from file, falling back to the last good copy"""
+        backup_file = self.signal_history_file + ".bak"
         try:
             if os.path.exists(self.signal_history_file):
-                with open(self.signal_history_file, 'r') as f:
-                    data = json.load(f)
-                
-                # Convert string timestamps back to datetime
-                for key, timestamp_str in data.items():
-                    self.last_signals[key] = datetime.fromisoformat(timestamp_str)
-                
+                self._read_signal_history(self.signal_history_file)
+                self._snapshot_readable = True
                 logger.info(f"Loaded {len(self.last_signals)} signal history records")
             else:
                 logger.info("No signal history file found, starting fresh")
                 
         except Exception as e:
             logger.error(f"Error loading signal history: {e}")
-            self.last_signals = {}
+            try:
+                self._read_signal_history(backup_file)
+                logger.warning(
+                    f"Recovered {len(self.last_signals)} signal history records from {backup_file}"
+                )
+            except Exception as backup_error:
+                logger.error(f"Error loading signal history backup: {backup_error}")
+                self.last_signals = {}
+                self._history_order = deque()
+        
+        self._replay_history_log()
+        
+        # Drop entries already past the 24-hour window; persist the smaller
+        # history on the next background flush
+        loaded = len(self.last_signals)
+        self._expire_signal_history(time.time())
+        if len(self.last_signals) < loaded:
+            self._history_dirty = True
+            logger.info(f"Pruned {loaded - len(self.last_signals)} expired signal history records")
+
+    def _history_log_path(self) -> str:
+        """Append-only log next to the snapshot: data/signal_history.log"""
+        return os.path.splitext(self.signal_history_file)[0] + ".log"
+
+    def _replay_history_log(self):
+        """Apply records appended since the last snapshot"""
+        log_file = self._history_log_path()
+        if not os.path.exists(log_file):
+            return
+        
+        replayed = 0
+        try:
+            with open(log_file, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = orjson.loads(line) if ORJSON_AVAILABLE else json.loads(line)
+                    except ValueError:
+                        # Torn trailing line from a crash mid-append
+                        break
+                    for key, timestamp in entry.items():
+                        self.last_signals[sys.intern(key)] = timestamp
+                        replayed += 1
+        except Exception as e:
+            logger.error(f"Error replaying signal history log: {e}")
+        
+        if replayed:
+            self._history_order = deque(
+                sorted((timestamp, key) for key, timestamp in self.last_signals.items())
+            )
+            # Fold the replayed records into the next snapshot
+            self._history_dirty = True
+            logger.info(f"Replayed {replayed} signal history log records")
+
+    def _read_signal_history(self, path: str):
+        """Parse a signal history file into last_signals and the expiry order"""
+        with open(path, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+        
+        # Epoch seconds; ISO strings from older files are converted
+        # Keys are interned to share storage with keys built at scan time
+        intern, parse = sys.intern, datetime.fromisoformat
+        self.last_signals = {
+            intern(key): parse(ts).timestamp() if isinstance(ts, str) else ts
+            for key, ts in data.items()
+        }
+        self._history_order = deque(
+            sorted((timestamp, key) for key, timestamp in self.last_signals.items())
+        )
+        # Rewrite migrated ISO entries as epochs on the next background flush,
+        # never during init; files already in epoch form are not rewritten
+        if any(isinstance(ts, str) for ts in data.values()):
+            self._history_dirty = True
 
     def _save_signal_history(self):
-        """Save signal history to file"""
+        """Save signal history to file (atomic: temp file + rename)"""
+        with self._history_lock:
+            self._write_history_snapshot()
+
+    def _write_history_snapshot(self):
+        """Snapshot body of _save_signal_history; caller holds _history_lock"""
         try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.signal_history_file), exist_ok=True)
+            data = dict(self.last_signals)
             
-            # Convert datetime to string for JSON storage
-            data = {}
-            for key, timestamp in self.last_signals.items():
-                data[key] = timestamp.isoformat()
+            if ORJSON_AVAILABLE:
+                payload = orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+            else:
+                payload = (json.dumps(data, separators=(',', ':')) + "\n").encode()
+
+            tmp_file = self.signal_history_file + ".tmp"
+            with open(tmp_file, 'wb', buffering=65536) as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            # Keep the last readable state for recovery after a bad write
+            if self._snapshot_readable:
+                self._refresh_history_backup()
+            os.replace(tmp_file, self.signal_history_file)
+            self._snapshot_readable = True
             
-            with open(self.signal_history_file, 'w') as f:
-                json.dump(data, f, indent=2)
-                
+            # The snapshot now covers everything in the log
+            self._truncate_history_log()
+            
+            self._history_dirty = False
+            self._dirty_count = 0
             logger.debug(f"Saved {len(data)} signal history records")
             
         except Exception as e:
             logger.error(f"Error saving signal history: {e}")
 
-    def _is_duplicate_signal(self, symbol: str, timeframe: str, direction: str) -> bool:
+    def _refresh_history_backup(self):
+        """Hard-link the current snapshot as .bak; best effort, never blocks a snapshot"""
+        backup_file = self.signal_history_file + ".bak"
+        link_file = backup_file + ".tmp"
+        try:
+            if os.path.exists(link_file):
+                os.remove(link_file)
+            # The link keeps the old inode once the new snapshot is renamed
+            # over the original name, so no data is copied
+            os.link(self.signal_history_file, link_file)
+            os.replace(link_file, backup_file)
+        except OSError as e:
+            logger.warning(f"Could not refresh signal history backup: {e}")
+
+    def _truncate_history_log(self):
+        """Empty the history log; caller holds _history_lock"""
+        if self._history_fp is not None:
+            self._history_fp.truncate(0)
+        elif os.path.exists(self._history_log_path()):
+            open(self._history_log_path(), 'wb').close()
+
+    def _flush_history_if_dirty(self):
+        """Save signal history if it changed since the last save"""
+        with self._history_lock:
+            if self._history_dirty:
+                self._write_history_snapshot()
+
+    def _is_duplicate_signal(self, signal_key: str, now: Optional[float] = None) -> bool:
         """
         Check if signal is duplicate within cooldown period
         
         Args:
-            symbol: Trading symbol
-            timeframe: Timeframe
-            direction: Signal direction (LONG/SHORT)
+            signal_key: "SYMBOL_TIMEFRAME_DIRECTION" history key
+            now: Current epoch seconds, shared across one scan (defaults to time.time())
             
         Returns:
             bool: True if signal is duplicate
         """
-        signal_key = f"{symbol}_{timeframe}_{direction}"
-        current_time = datetime.now()
+        current_time = now or time.time()
         
         # Check if we've sent this signal recently
-        if signal_key in self.last_signals:
-            last_time = self.last_signals[signal_key]
-            time_diff = current_time - last_time
+        last_sent = self.last_signals.get(signal_key)
+        if last_sent is not None:
+            elapsed = current_time - last_sent
             
             # If still within cooldown period
-            if time_diff.total_seconds() < (self.cooldown_minutes * 60):
-                remaining_minutes = self.cooldown_minutes - (time_diff.total_seconds() / 60)
+            if elapsed < self.cooldown_seconds:
+                remaining_minutes = (self.cooldown_seconds - elapsed) / 60
                 logger.debug(f"Signal cooldown active for {signal_key}: {remaining_minutes:.1f} minutes remaining")
                 return True
         
-        # Clean up old data (keep only last 24 hours)
-        cutoff_time = current_time - timedelta(hours=24)
-        keys_to_remove = [
-            key for key, timestamp in self.last_signals.items()
-            if timestamp < cutoff_time
-        ]
-        for key in keys_to_remove:
-            del self.last_signals[key]
-        
+        self._expire_signal_history(current_time)
         return False
 
-    def _record_signal(self, symbol: str, timeframe: str, direction: str):
-        """Record signal that was sent"""
-        signal_key = f"{symbol}_{timeframe}_{direction}"
-        self.last_signals[signal_key] = datetime.now()
+    def _expire_signal_history(self, current_time: float):
+        """Clean up old data (keep only last 24 hours)"""
+        # Only expired entries are visited. A key re-recorded later has a
+        # newer timestamp and stays.
+        cutoff_time = current_time - 24 * 3600
+        history_order = self._history_order
+        while history_order and history_order[0][0] < cutoff_time:
+            timestamp, key = history_order.popleft()
+            if self.last_signals.get(key) == timestamp:
+                del self.last_signals[key]
+
+    def _claim_signal(self, signal_key: str, now: Optional[float] = None) -> bool:
+        """
+        Claim a signal for the cooldown window, recording it if new
+        
+        The local history is checked first, so signals this process already
+        sent never cost a network hop. Local misses go to Redis as one
+        atomic SET NX EX, so replicas never send the same signal twice.
+        The signal is recorded locally only once the claim succeeded (or
+        Redis is unreachable and the local history decides alone).
+        
+        Returns:
+            bool: True if the signal is new (and now recorded), False if it is a duplicate
+        """
+        now = now or time.time()
+        with self._history_lock:
+            if self._is_duplicate_signal(signal_key, now=now):
+                return False
+        
+        if self._redis is not None:
+            try:
+                # Rejected: another replica holds the claim, nothing is recorded
+                if not self._redis.set(
+                    f"sig:{signal_key}", b"1", ex=self.cooldown_seconds, nx=True
+                ):
+                    return False
+            except Exception as e:
+                logger.warning(f"Redis dedup unavailable, using local signal history: {e}")
+        
+        # Check again and record under one lock: concurrent scans of the same
+        # key (overlapping jobs, manual re-runs) let exactly one caller through
+        with self._history_lock:
+            if self._is_duplicate_signal(signal_key, now=now):
+                return False
+            self._record_signal(signal_key, now=now)
+        
+        return True
+
+    def _release_signal(self, signal_key: str, timestamp: float):
+        """
+        Undo the claim recorded at timestamp so the signal can fire again
+        
+        A {key: 0} log line marks the release; it replays as an expired
+        entry and is pruned on load.
+        """
+        with self._history_lock:
+            if self.last_signals.get(signal_key) != timestamp:
+                return  # Re-recorded since, or already expired
+            del self.last_signals[signal_key]
+            self._history_dirty = True
+            self._append_history_log(signal_key, 0)
+        
+        if self._redis is not None:
+            try:
+                self._redis.delete(f"sig:{signal_key}")
+            except Exception as e:
+                logger.warning(f"Error releasing Redis signal claim {signal_key}: {e}")
+        
+        logger.warning(f"Signal alert not delivered, cooldown released: {signal_key}")
+
+    def _record_signal(self, signal_key: str, now: Optional[float] = None):
+        """Record signal that was sent under its "SYMBOL_TIMEFRAME_DIRECTION" key"""
+        timestamp = now or time.time()
         
-        # Save to file immediately
-        self._save_signal_history()
+        # One log line per record; the full snapshot is written every
+        # HISTORY_SNAPSHOT_EVERY records, by the history_flush job, and on stop
+        with self._history_lock:
+            self.last_signals[signal_key] = timestamp
+            self._history_order.append((timestamp, signal_key))
+            # Evict oldest first; stale order entries of re-recorded keys are skipped
+            while len(self.last_signals) > self.MAX_SIGNAL_HISTORY:
+                old_timestamp, old_key = self._history_order.popleft()
+                if self.last_signals.get(old_key) == old_timestamp:
+                    del self.last_signals[old_key]
+            self._history_dirty = True
+            self._append_history_log(signal_key, timestamp)
+            self._dirty_count += 1
+            # Snapshot on the I/O pool so the scan thread never waits on fsync;
+            # submitted once when the threshold is crossed
+            if self._dirty_count == self.HISTORY_SNAPSHOT_EVERY:
+                self._io_pool.submit(self._flush_history_if_dirty)
         logger.debug(f"Recorded signal: {signal_key}")
 
+    def _append_history_log(self, signal_key: str, timestamp: float):
+        """Append one {key: epoch} line to the history log"""
+        try:
+            if self._history_fp is None:
+                self._history_fp = open(self._history_log_path(), 'ab', buffering=8192)
+            entry = {signal_key: timestamp}
+            if ORJSON_AVAILABLE:
+                line = orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+            else:
+                line = (json.dumps(entry, separators=(',', ':')) + "\n").encode()
+            self._history_fp.write(line)
+            self._history_fp.flush()
+        except Exception as e:
+            logger.error(f"Error appending signal history log: {e}")
+
+    def _close_history_log(self):
+        """Close the history log handle (reopened on the next record)"""
+        if self._history_fp is not None:
+            try:
+                self._history_fp.close()
+            except Exception as e:
+                logger.warning(f"Error closing signal history log: {e}")
+            self._history_fp = None
+
     def set_services(self, signal_detector, position_manager, line_notifier, sheets_logger):
         """
         Inject refactored services
@@ -159,6 +467,15 @@ class SignalScheduler:
         
         logger.info("Refactored services injected into scheduler")
 
+    def _get_positions_summary_cached(self) -> Dict:
+        """PositionManager summary, reused for POSITION_SUMMARY_TTL seconds"""
+        ts, summary = self._pos_summary_cache
+        now = time.monotonic()
+        if summary is None or now - ts >= self.POSITION_SUMMARY_TTL:
+            summary = self.position_manager.get_positions_summary()
+            self._pos_summary_cache = (now, summary)
+        return summary
+
     def start_scheduler(self):
         """Start the automated scheduler"""
         if self.running:
@@ -169,6 +486,8 @@ class SignalScheduler:
             logger.error("Required services not set")
             return
         
+        from apscheduler.triggers.interval import IntervalTrigger
+        
         # Job 1: Scan 4H signals - ทุก 15 นาที
         self.scheduler.add_job(
             func=self._scan_4h_signals,
@@ -180,14 +499,14 @@ class SignalScheduler:
             replace_existing=True,
         )
 
-        # Job 2: ถูกต้องแล้ว ✅
+        # Job 2: 1D + 4H in one pass every 4 hours (4H skipped if the 15-minute job has it)
         self.scheduler.add_job(
-            func=self._scan_1d_signals,
+            func=self._scan_combined,
             trigger="cron",
             hour="0,4,8,12,16,20",
             minute=0,
             id="scan_1d_signals",
-            name="1D Signal Scanner v2.0 (Every 4H)",
+            name="1D+4H Signal Scanner v2.0 (Every 4H)",
             replace_existing=True,
         )
         
@@ -211,9 +530,21 @@ class SignalScheduler:
             replace_existing=True,
         )
         
+        # Job 4: Flush signal history to file every 30 seconds if changed
+        self.scheduler.add_job(
+            func=self._flush_history_if_dirty,
+            trigger=IntervalTrigger(seconds=30),
+            id="history_flush",
+            name="Signal History Flush v2.0",
+            replace_existing=True,
+        )
+        
         # Start scheduler
         self.scheduler.start()
         self.running = True
+        # Last snapshot when the process exits without stop_scheduler; held
+        # only while running so a stopped scheduler can be collected
+        atexit.register(self._flush_history_if_dirty)
         
         logger.info("SignalScheduler v2.0 started successfully")
         logger.info("Scheduled jobs:")
@@ -229,11 +560,21 @@ class SignalScheduler:
             logger.warning("Scheduler not running")
             return
         
-        # Save history before stopping
-        self._save_signal_history()
+        # Flush pending history before stopping
+        atexit.unregister(self._flush_history_if_dirty)
+        self._flush_history_if_dirty()
+        self._close_history_log()
         
         self.scheduler.shutdown(wait=False)
         self.running = False
+
+        # Let in-flight notifications finish; fresh pools serve a restart
+        self._io_pool.shutdown(wait=True)
+        self._io_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="sig-io")
+        self._notify_pool.shutdown(wait=True)
+        self._notify_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sig-notify")
+        self._sheets_pool.shutdown(wait=True)
+        self._sheets_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sig-sheets")
         
         logger.info("SignalScheduler v2.0 stopped")
 
@@ -252,16 +593,16 @@ class SignalScheduler:
         next_run_times = {}
         
         for job in self.scheduler.get_jobs():
-            job_info = {
-                "id": job.id,
+            job_id = job.id
+            next_run = job.next_run_time
+            next_run_iso = next_run.isoformat() if next_run else None
+            jobs.append({
+                "id": job_id,
                 "name": job.name,
-                "next_run": (
-                    job.next_run_time.isoformat() if job.next_run_time else None
-                ),
+                "next_run": next_run_iso,
                 "trigger": str(job.trigger),
-            }
-            jobs.append(job_info)
-            next_run_times[job.id] = job_info["next_run"]
+            })
+            next_run_times[job_id] = next_run_iso
         
         return {
             "status": "running",
@@ -281,128 +622,155 @@ class SignalScheduler:
 
     def _scan_4h_signals(self):
         """Scan 4H signals"""
-        try:
-            logger.info("Starting 4H signal scan v2.0...")
-            
-            symbols = Config.DEFAULT_SYMBOLS if hasattr(Config, 'DEFAULT_SYMBOLS') else ["BTCUSDT", "ETHUSDT"]
-        
-            if not symbols:
-                logger.warning("No symbols configured for scanning")
-                return
-            
-            active_signals = self.signal_detector.get_active_signals(symbols, ["4h"])
-            logger.info(f"Found {len(active_signals)} active signals on 4H")
-            
-            processed_count = 0
-            for signal in active_signals:
-                if self._process_signal_refactored(signal, "4h"):
-                    processed_count += 1
-            
-            logger.info(f"Processed {processed_count}/{len(active_signals)} signals on 4H")
-            
-        except Exception as e:
-            logger.error(f"Error in 4H signal scan: {e}")
+        return self._scan_signals(("4h",))
 
     def _scan_1d_signals(self):
         """Scan 1D signals using refactored SignalDetector"""
+        return self._scan_signals(("1d",))
+
+    def _scan_combined(self):
+        """Scan 4H and 1D signals in one detector pass (the every-4H slots)"""
+        return self._scan_signals(("4h", "1d"))
+
+    def _scan_signals(self, timeframes: Tuple[str, ...]) -> bool:
+        """
+        Scan the given timeframes in one SignalDetector call
+        
+        Timeframes already being scanned by another job are skipped, so
+        overlapping firings (the 15-minute 4H job and the every-4H combined
+        job at the same minute) scan each timeframe once.
+        
+        Returns:
+            bool: False if every timeframe was already being scanned (nothing ran)
+        """
+        with self._scan_lock:
+            claimed = tuple(tf for tf in timeframes if tf not in self._scan_inflight)
+            self._scan_inflight.update(claimed)
+        
+        if not claimed:
+            logger.info(f"Skipping {'+'.join(timeframes).upper()} scan - already in progress")
+            return False
+        
+        label = "+".join(claimed).upper()
         try:
-            logger.info("Starting 1D signal scan v2.0...")
+            logger.info(f"Starting {label} signal scan v2.0...")
             
-            symbols = Config.DEFAULT_SYMBOLS if hasattr(Config, 'DEFAULT_SYMBOLS') else ["BTCUSDT", "ETHUSDT"]
+            symbols = self._symbols
         
             if not symbols:
                 logger.warning("No symbols configured for scanning")
-                return
+                return True
             
             # Use refactored SignalDetector
-            active_signals = self.signal_detector.get_active_signals(symbols, ["1d"])
-            logger.info(f"Found {len(active_signals)} active signals on 1D")
+            active_signals = self.signal_detector.get_active_signals(symbols, list(claimed))
+            logger.info(f"Found {len(active_signals)} active signals on {label}")
             
             processed_count = 0
+            now = time.time()
             for signal in active_signals:
-                if self._process_signal_refactored(signal, "1d"):
+                timeframe = signal.get("timeframe", claimed[0])
+                if self._process_signal_refactored(signal, timeframe, now=now):
                     processed_count += 1
             
-            logger.info(f"Processed {processed_count}/{len(active_signals)} signals on 1D")
+            logger.info(f"Processed {processed_count}/{len(active_signals)} signals on {label}")
             
         except Exception as e:
-            logger.error(f"Error in 1D signal scan: {e}")
-            if self.line_notifier:
+            logger.error(f"Error in {label} signal scan: {e}")
+            if "1d" in claimed and self.line_notifier:
                 try:
                     self.line_notifier.send_error_alert(
-                        f"1D signal scan failed: {str(e)}", "Scheduler v2.0"
+                        f"{label} signal scan failed: {str(e)}", "Scheduler v2.0"
                     )
                 except:
                     pass
+        finally:
+            with self._scan_lock:
+                self._scan_inflight.difference_update(claimed)
+        
+        return True
 
-    def _process_signal_refactored(self, signal: Dict, timeframe: str) -> bool:
+    def _process_signal_refactored(
+        self, signal: Dict, timeframe: str, now: Optional[float] = None
+    ) -> bool:
         """
         Process signal using refactored architecture
         
         Args:
             signal: Signal data from SignalDetector
             timeframe: Timeframe being processed
+            now: Scan time (epoch seconds) shared by dedup check and history record
             
         Returns:
             bool: True if signal was processed successfully
         """
         try:
+            # Cheapest check first: most candidates fail the strength threshold (75%)
+            signal_strength = signal.get("signal_strength", 0)
+            if signal_strength < 75:
+                logger.debug(
+                    f"Skipping {signal.get('symbol')} {timeframe} - signal strength {signal_strength} < 75"
+                )
+                return False
+            
             # Extract basic signal information
             symbol = signal.get("symbol")
-            signals = signal.get("signals", {})
-            signal_strength = signal.get("signal_strength", 0)
+            signals = signal.get("signals", self._EMPTY)
             position_created = signal.get("position_created", False)
             
             # Validate basic data
             if not symbol:
                 return False
             
-            # Check signal strength threshold (75%)
-            if signal_strength < 75:
-                logger.debug(f"Skipping {symbol} {timeframe} - signal strength {signal_strength} < 75")
-                return False
-            
             # Determine trading direction
-            direction = None
-            if signals.get("buy"):
-                direction = "LONG"
-            elif signals.get("short"):
-                direction = "SHORT"
+            direction = next(
+                (direction for flag, direction in self._DIRECTIONS if signals.get(flag)), None
+            )
             
             if not direction:
                 logger.debug(f"No valid signal direction for {symbol} {timeframe}")
                 return False
             
-            # Check for duplicate signals
-            if self._is_duplicate_signal(symbol, timeframe, direction):
+            # SignalDetector should have already created position if valid
+            if not position_created and not self.record_unfilled_signals:
+                logger.debug(f"Position not auto-created for {symbol} {timeframe}")
+                return False
+            
+            now = now or time.time()
+            # Interned: the same symbol/timeframe/direction keys recur every scan
+            signal_key = sys.intern(f"{sys.intern(symbol)}_{sys.intern(timeframe)}_{direction}")
+
+            # Check for duplicate signals and record the signal in history
+            if not self._claim_signal(signal_key, now=now):
                 logger.info(f"⏭️ SKIPPED DUPLICATE: {symbol} {timeframe} {direction}")
                 return False
             
-            # SignalDetector should have already created position if valid
             if not position_created:
+                # RECORD_UNFILLED_SIGNALS: the claim above still blocks duplicate attempts
                 logger.debug(f"Position not auto-created for {symbol} {timeframe}")
-                # Still record to prevent duplicate attempts
-                self._record_signal(symbol, timeframe, direction)
                 return False
             
-            # Send LINE notification for new signals with positions
+            # Send LINE notification for new signals with positions; an alert
+            # that never went out gives its cooldown back
             if self.line_notifier:
-                try:
-                    self.line_notifier.send_signal_alert(signal)
-                    logger.info(f"Sent LINE notification for {symbol} {timeframe} {direction}")
-                except Exception as e:
-                    logger.warning(f"Failed to send LINE notification: {e}")
+                future = self._submit_io(
+                    self.line_notifier.send_signal_alert, signal,
+                    f"Sent LINE notification for {symbol} {timeframe} {direction}",
+                    "Failed to send LINE notification",
+                )
+                def _release_if_undelivered(f, key=signal_key, ts=now):
+                    if f.exception() or f.result() is False:
+                        self._release_signal(key, ts)
+
+                future.add_done_callback(_release_if_undelivered)
             
             # Log to Google Sheets for new signals with positions
             if self.sheets_logger:
-                try:
-                    self.sheets_logger.log_trading_journal(signal)
-                    logger.info(f"Logged to Google Sheets: {symbol} {timeframe} {direction}")
-                except Exception as e:
-                    logger.warning(f"Failed to log to Google Sheets: {e}")
-            
-            # Record signal in history
-            self._record_signal(symbol, timeframe, direction)
+                self._submit_io(
+                    self.sheets_logger.log_trading_journal, signal,
+                    f"Logged to Google Sheets: {symbol} {timeframe} {direction}",
+                    "Failed to log to Google Sheets",
+                    pool=self._sheets_pool,
+                )
             
             logger.info(f"Processed new signal: {symbol} {timeframe} {direction} (Strength: {signal_strength})")
             return True
@@ -411,6 +779,34 @@ class SignalScheduler:
             logger.error(f"Error processing signal {signal.get('symbol', 'UNKNOWN')}: {e}")
             return False
 
+    def _submit_io(
+        self, func: Callable, arg, success_msg: str, failure_msg: str,
+        pool: Optional[ThreadPoolExecutor] = None, expected: Optional[int] = None,
+    ):
+        """
+        Run a LINE/Sheets call on the I/O pool (or the given pool) and log its outcome
+        
+        When expected is given, func returns how many items it delivered and
+        a lower count is reported as a failure; a False result is a failure too.
+        
+        Returns:
+            Future of the call
+        """
+        def _done(future):
+            error = future.exception()
+            if error:
+                logger.warning(f"{failure_msg}: {error}")
+            elif future.result() is False:
+                logger.warning(failure_msg)
+            elif expected is not None and future.result() < expected:
+                logger.warning(f"{failure_msg}: only {future.result()} of {expected} sent")
+            else:
+                logger.info(success_msg)
+
+        future = (pool or self._io_pool).submit(func, arg)
+        future.add_done_callback(_done)
+        return future
+
     def _update_positions_refactored(self):
         """
         Update positions using refactored PositionManager
@@ -435,66 +831,87 @@ class SignalScheduler:
             
             # Trigger PositionManager to update all positions
             updates = self.position_manager.update_positions()
+            self._pos_summary_cache = (0.0, None)
             
             # Process any position updates for notifications
-            notifications_sent = 0
             sheets_logged = 0
+            notifications = []
             
             for position_id, update_info in updates.items():
-                try:
-                    # Check if any important events occurred
-                    events = []
-                    if update_info.get('position_closed'):
-                        events.append("Position closed")
-                    
-                    for tp_level in ['TP1', 'TP2', 'TP3']:
-                        if update_info.get(f'{tp_level}_hit', {}).get('hit', False):
-                            events.append(f"{tp_level} hit")
-                    
-                    if update_info.get('sl_hit', {}).get('hit', False):
-                        events.append("SL hit")
-                    
-                    if events:
-                        logger.info(f"Position {position_id}: {', '.join(events)}")
-                        
-                        # Send LINE notification if available
-                        if self.line_notifier:
-                            try:
-                                # Format update for LINE notification
-                                position_data = self.position_manager.positions.get(position_id)
-                                if position_data:
-                                    notification_data = {
-                                        "position": position_data,
-                                        "updates": update_info,
-                                        "events": events
-                                    }
-                                    self.line_notifier.send_position_update(notification_data)
-                                    notifications_sent += 1
-                            except Exception as e:
-                                logger.warning(f"Failed to send position update notification: {e}")
-                        
-                        # Log to Google Sheets if available
-                        if self.sheets_logger:
-                            try:
-                                position_data = self.position_manager.positions.get(position_id)
-                                if position_data:
-                                    self.sheets_logger.log_position_update({
-                                        "position": position_data,
-                                        "updates": update_info
-                                    })
-                                    sheets_logged += 1
-                            except Exception as e:
-                                logger.warning(f"Failed to log position update: {e}")
-                                
-                except Exception as e:
-                    logger.error(f"Error processing update for {position_id}: {e}")
+                notification_data, sheets_data = self._handle_position_update(position_id, update_info)
+                if notification_data:
+                    notifications.append(notification_data)
+                # Sheets rows are read-modify-written, so updates go to the
+                # single Sheets writer one at a time, in tick order
+                if sheets_data:
+                    self._submit_io(
+                        self.sheets_logger.log_position_update, sheets_data,
+                        f"Logged position update for {position_id} to Google Sheets",
+                        f"Failed to log position update for {position_id}",
+                        pool=self._sheets_pool,
+                    )
+                    sheets_logged += 1
+            
+            # One LINE batch for the whole tick instead of a push per position,
+            # handed to the sender thread so this job never waits on LINE
+            if notifications and self.line_notifier:
+                self._submit_io(
+                    self.line_notifier.send_position_updates, notifications,
+                    f"Sent {len(notifications)} position update notifications via LINE",
+                    "Failed to send position update notifications",
+                    pool=self._notify_pool, expected=len(notifications),
+                )
             
-            if notifications_sent > 0 or sheets_logged > 0:
-                logger.info(f"Position updates: {notifications_sent} LINE notifications, {sheets_logged} sheets logs")
+            if notifications or sheets_logged > 0:
+                logger.info(f"Position updates: {len(notifications)} LINE notifications queued, {sheets_logged} sheets logs queued")
                 
         except Exception as e:
             logger.error(f"Error in refactored position update: {e}")
 
+    def _handle_position_update(
+        self, position_id: str, update_info: Dict
+    ) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Build the LINE notification and Sheets log entry for one position update
+
+        Returns:
+            Tuple of (notification data for the tick's LINE batch or None,
+            log_position_update data or None)
+        """
+        notification_data = None
+        sheets_data = None
+
+        try:
+            # Check if any important events occurred (each flag read once)
+            hits = [update_info.get(key, self._EMPTY).get('hit') for key, _ in self._HIT_EVENTS]
+            events = (["Position closed"] if update_info.get('position_closed') else []) + [
+                label for (_, label), hit in zip(self._HIT_EVENTS, hits) if hit
+            ]
+            
+            if events:
+                logger.info(f"Position {position_id}: {', '.join(events)}")
+                position_data = self.position_manager.positions.get(position_id)
+                
+                # Format update for LINE notification (sent as one batch per tick)
+                if self.line_notifier and position_data:
+                    notification_data = {
+                        "position": position_data,
+                        "updates": update_info,
+                        "events": events
+                    }
+                
+                # Log to Google Sheets if available
+                if self.sheets_logger and position_data:
+                    sheets_data = {
+                        "position": position_data,
+                        "updates": update_info
+                    }
+                        
+        except Exception as e:
+            logger.error(f"Error processing update for {position_id}: {e}")
+
+        return notification_data, sheets_data
+
     def _send_daily_summary(self):
         """Send daily summary using refactored services"""
         try:
@@ -512,14 +929,14 @@ class SignalScheduler:
             # Get position summary from PositionManager
             if self.position_manager:
                 try:
-                    position_summary = self.position_manager.get_positions_summary()
+                    position_summary = self._get_positions_summary_cached()
                 except:
                     position_summary = {}
             else:
                 position_summary = {}
             
             daily_summary = {
-                "date": datetime.now().strftime("%Y-%m-%d"),
+                "date": date.today().isoformat(),
                 "version": "2.0-refactored",
                 "total_signals": stats.get("total_trades", 0),
                 "active_positions": position_summary.get("active_positions", 0),
@@ -561,7 +978,7 @@ class SignalScheduler:
             # Add position summary if available
             if self.position_manager:
                 try:
-                    position_summary = self.position_manager.get_positions_summary()
+                    position_summary = self._get_positions_summary_cached()
                     scheduler_status["position_summary"] = position_summary
                 except Exception as e:
                     logger.error(f"Error getting position summary: {e}")
@@ -579,7 +996,8 @@ class SignalScheduler:
         """Force immediate signal scan"""
         try:
             if timeframe == "1d":
-                self._scan_1d_signals()
+                if not self._scan_1d_signals():
+                    return {"status": "1D scan already in progress", "version": "2.0-refactored"}
                 return {"status": "1D scan completed", "version": "2.0-refactored"}
             else:
                 return {"error": "Invalid timeframe. Use '1d' only"}
@@ -598,24 +1016,28 @@ class SignalScheduler:
 
     def clear_signal_history(self):
         """Clear all signal history (for testing)"""
-        self.last_signals = {}
-        self._save_signal_history()
+        with self._history_lock:
+            self.last_signals = {}
+            self._history_order = deque()
+            # Logged records go first so they are never replayed, even if
+            # the snapshot below fails
+            self._truncate_history_log()
+            self._dirty_count = 0
+            self._history_dirty = True
+            self._write_history_snapshot()
         logger.info("Signal history cleared")
 
     def get_signal_history(self) -> Dict:
         """Get signal history with timestamps"""
         history = {}
+        now = time.time()
         for key, timestamp in self.last_signals.items():
             history[key] = {
-                "timestamp": timestamp.isoformat(),
-                "minutes_ago": (datetime.now() - timestamp).total_seconds() / 60
+                "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+                "minutes_ago": (now - timestamp) / 60
             }
         return history
 
-    def _process_signal(self, signal: Dict, timeframe: str):
-        """Legacy method - redirects to refactored version"""
-        return self._process_signal_refactored(signal, timeframe)
-
-    def _update_positions(self):
-        """Legacy method - redirects to refactored version"""
-        self._update_positions_refactored()
\ No newline at end of file
+    # Legacy names - aliases of the refactored versions
+    _process_signal = _process_signal_refactored
+    _update_positions = _update_positions_refactored
\ No newline at end of file
@@ -9,7 +9,7 @@ import json
 import logging
 import os
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 try:
     import gspread
@@ -485,18 +485,9 @@ class SheetsLogger:
         try:
             symbol = position_data.get("symbol", "")
             entry_price = position_data.get("entry_price", 0)
-            tp_price = tp_info.get("target_price", 0)
             current_price = tp_info.get("price", 0)
-            
-            # Determine which TP was hit from the price
-            tp_levels = position_data.get("tp_levels", {})
-            tp_level = "TP1"  # Default
-            
-            for tp_name, tp_target in tp_levels.items():
-                if abs(tp_target - tp_price) < 0.001:  # Account for floating point precision
-                    tp_level = tp_name
-                    break
-            
+            tp_level = self._resolve_tp_level(position_data, tp_info)
+
             return self.update_trading_result(symbol, entry_price, f"take_profit_{tp_level[-1]}", current_price)
 
         except Exception as e:
@@ -546,16 +537,8 @@ class SheetsLogger:
         try:
             symbol = position_data.get("symbol", "")
             entry_price = position_data.get("entry_price", 0)
-            close_reason = position_data.get("close_reason", "MANUAL")
-            
-            # Determine if it's a win or loss based on close reason
-            if close_reason in ["ALL_TP_HIT", "TP3_HIT"]:
-                result_type = "WIN"
-            elif close_reason == "SL_HIT":
-                result_type = "LOSS"
-            else:
-                result_type = "MANUAL_CLOSE"
-            
+            result_type = self._close_result_type(position_data)
+
             # Update the trading journal
             return self._update_position_status(symbol, entry_price, result_type)
 
@@ -563,6 +546,118 @@ class SheetsLogger:
             logger.error(f"Error logging position close: {e}")
             return False
 
+    def _resolve_tp_level(self, position_data: Dict, tp_info: Dict) -> str:
+        """Determine which TP was hit from the target price"""
+        tp_price = tp_info.get("target_price", 0)
+        for tp_name, tp_target in position_data.get("tp_levels", {}).items():
+            if abs(tp_target - tp_price) < 0.001:  # Account for floating point precision
+                return tp_name
+        return "TP1"  # Default
+
+    def _close_result_type(self, position_data: Dict) -> str:
+        """Determine if a closed position is a win or loss based on close reason"""
+        close_reason = position_data.get("close_reason", "MANUAL")
+        if close_reason in ["ALL_TP_HIT", "TP3_HIT"]:
+            return "WIN"
+        if close_reason == "SL_HIT":
+            return "LOSS"
+        return "MANUAL_CLOSE"
+
+    def batch_log_events(self, events: List[Tuple[str, Dict, Optional[Dict]]]) -> int:
+        """
+        Apply many TP/SL/close events to the Trading Journal in one round-trip
+
+        Reads the journal once, resolves every event against the in-memory
+        records (in order, so a TP followed by a close on the same trade
+        behaves as the individual log_* calls would), then writes the same
+        cells, Win Rate included, with a single batch_update.
+
+        Args:
+            events: List of (kind, position_data, info) where kind is
+                    "tp", "sl" or "close"
+
+        Returns:
+            int: Number of events that matched a journal row
+        """
+        if not self._initialized or not self.spreadsheet:
+            logger.warning("SheetsLogger not initialized, skipping batch log")
+            return 0
+
+        try:
+            worksheet = self.worksheet
+            if not worksheet:
+                logger.error("Cannot access Trading_Journal worksheet")
+                return 0
+
+            # Raw cell text, as worksheet.cell() returns it for the marks
+            records = worksheet.get_all_records(numericise_ignore=["all"])
+            cells = {}  # (row, col) -> value; later events win
+            applied = 0
+
+            # Win Rate state, advanced per event like _update_win_rate
+            results = [r.get("Win/Loss") for r in records]
+            completed = sum(1 for r in results if r in ("WIN", "LOSS"))
+            wins = results.count("WIN")
+            last_result_row = max(
+                (i for i, r in enumerate(results, start=2) if r), default=0
+            )
+
+            for kind, position_data, info in events:
+                symbol = position_data.get("symbol", "")
+                entry_price = position_data.get("entry_price", 0)
+
+                for i, record in enumerate(records, start=2):  # row 1 is header
+                    if not (record.get("Symbol") == symbol and
+                            abs(float(record.get("Entry", 0)) - entry_price) < 0.001 and
+                            not record.get("Win/Loss")):
+                        continue
+
+                    if kind == "sl":
+                        cells[(i, 5)] = f"❌ {record.get('SL', '')}"
+                        record["Win/Loss"] = "LOSS"
+                    elif kind == "tp":
+                        tp_level = self._resolve_tp_level(position_data, info or {})
+                        col = {"TP1": 6, "TP2": 7, "TP3": 8}.get(tp_level)
+                        if col is None:
+                            break
+                        cells[(i, col)] = f"✅ {record.get(tp_level, '')}"
+                        record["Win/Loss"] = "WIN"
+                    else:  # close
+                        record["Win/Loss"] = self._close_result_type(position_data)
+
+                    cells[(i, 9)] = record["Win/Loss"]  # Win/Loss column
+                    applied += 1
+
+                    # Win Rate goes in the last row with a result (column J = 10)
+                    if record["Win/Loss"] in ("WIN", "LOSS"):
+                        completed += 1
+                        wins += record["Win/Loss"] == "WIN"
+                    last_result_row = max(last_result_row, i)
+                    if completed:
+                        cells[(last_result_row, 10)] = f"{round(wins / completed * 100, 1)}%"
+                    break
+                else:
+                    if kind != "close":  # Close after SL/TP finds the row already settled
+                        logger.warning(f"No matching trade found for {symbol} at {entry_price}")
+
+            if not cells:
+                return 0
+
+            worksheet.batch_update(
+                [
+                    {"range": gspread.utils.rowcol_to_a1(row, col), "values": [[value]]}
+                    for (row, col), value in cells.items()
+                ],
+                value_input_option="USER_ENTERED",
+            )
+
+            logger.info(f"Batch logged {applied}/{len(events)} events ({len(cells)} cells)")
+            return applied
+
+        except Exception as e:
+            logger.error(f"Error batch logging events: {e}")
+            return 0
+
     def update_trading_result(self, symbol: str, entry_price: float, triggered_level: str, triggered_price: float) -> bool:
         """
         Update trading result with TP/SL marks
@@ -681,7 +776,7 @@ class SheetsLogger:
             logger.info(f"Win Rate calculated: {wins}/{total} = {win_rate}")
             
             # Update Win Rate in the last row with data
-            for i in range(len(records), 1, -1):  # From bottom to top
+            for i in range(len(records) + 1, 1, -1):  # From bottom to top
                 if records[i-2].get("Win/Loss"):  # i-2 because records start from 0
                     worksheet.update_cell(i, 10, win_rate)  # Win Rate column (column J = 10)
                     logger.info(f"Win Rate updated in row {i}: {win_rate}")
@@ -3,7 +3,8 @@
 import logging
 from datetime import datetime
 import time
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
 
 from .indicators import TechnicalIndicators
 from ..utils.core_utils import ErrorHandler
@@ -16,6 +17,11 @@ logger = logging.getLogger(__name__)
 class SignalDetector:
     """Detect trading signals using Squeeze + MACD Uncle Cholok + RSI strategy - CONSERVATIVE"""
 
+    # Concurrent kline downloads when warming the cache before a scan. A scan
+    # is ~100 requests of weight 2 (limit=100), far below Binance futures'
+    # 2400/min budget; 4 in flight keeps bursts modest
+    PREFETCH_WORKERS = 4
+
     def __init__(self, config: Dict):
         """Initialize signal detector with refactored services"""
         # Extract refactored services
@@ -792,12 +798,50 @@ class SignalDetector:
             logger.error(f"Error calculating risk levels: {e}")
             return {"error": "Failed to calculate risk levels"}
 
+    def _prefetch_klines(self, symbols: List[str], timeframes: List[str]) -> Set[Tuple[str, str]]:
+        """
+        Download klines for every symbol/timeframe concurrently to warm the DataManager cache
+        
+        analyze_symbol then reads from the cache, so the sequential scan
+        (and its position creation) no longer waits on one request at a time.
+        Workers stop issuing requests once Binance answers 429/418.
+        
+        Returns:
+            Set of (symbol, timeframe) pairs now held in the cache
+        """
+        # analyze_symbol always reads the 1D trend as well
+        pairs = {(symbol, tf) for symbol in symbols for tf in (*timeframes, "1d")}
+        if len(pairs) < 2:
+            return set()
+
+        data_manager = self.data_manager
+
+        def fetch(pair: Tuple[str, str]) -> Optional[Tuple[str, str]]:
+            if data_manager.is_rate_limited():
+                return None
+            data_manager.get_klines(pair[0], pair[1], limit=100)
+            return pair if data_manager.has_cached_klines(*pair) else None
+
+        try:
+            workers = min(self.PREFETCH_WORKERS, len(pairs))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kline-prefetch") as pool:
+                cached = {pair for pair in pool.map(fetch, pairs) if pair}
+        except Exception as e:
+            logger.warning(f"Kline prefetch failed, scanning sequentially: {e}")
+            return set()
+
+        if len(cached) < len(pairs):
+            logger.warning(f"Kline prefetch cached {len(cached)}/{len(pairs)} series")
+        return cached
+
     def scan_multiple_symbols(self, symbols: List[str], timeframes: List[str] = None) -> List[Dict]:
         """Scan multiple symbols for signals across different timeframes"""
         if timeframes is None:
             timeframes = ["4h", "1d"]
 
         results = []
+        # Series already cached need no per-request spacing below
+        prefetched = self._prefetch_klines(symbols, timeframes)
 
         for symbol in symbols:
             for timeframe in timeframes:
@@ -846,7 +890,8 @@ class SignalDetector:
                     if result:
                         results.append(result)
                 
-                time.sleep(0.2)
+                if (symbol, timeframe) not in prefetched or (symbol, "1d") not in prefetched:
+                    time.sleep(0.2)
 
         return results
         
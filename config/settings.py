@@ -26,6 +26,12 @@ class Config:
     # Refactored service settings
     SIGNAL_COOLDOWN_MINUTES = int(os.getenv("SIGNAL_COOLDOWN_MINUTES", "30"))
     PRICE_MONITOR_INTERVAL = int(os.getenv("PRICE_MONITOR_INTERVAL", "30"))  # seconds
+    # Signals that opened no position stay out of the cooldown by default so
+    # they can fire on the next scan; "true" restores the old behavior of
+    # putting them into cooldown as well
+    RECORD_UNFILLED_SIGNALS = os.getenv("RECORD_UNFILLED_SIGNALS", "false").lower() == "true"
+    # Optional shared signal dedup store for several scheduler replicas (needs redis)
+    REDIS_URL = os.getenv("REDIS_URL", "")
 
     # ================================================================
     # 📡 LAYER 2: External API Connections (updated for ConfigManager)
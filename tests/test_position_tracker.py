@@ -0,0 +1,247 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+
+# Fix import path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.position_tracker import Position, PositionTracker
+
+RISK_LEVELS = {
+    'stop_loss': 95.0,
+    'take_profit_1': 105.0,
+    'take_profit_2': 110.0,
+    'take_profit_3': 115.0,
+}
+
+
+class TestPositionPersistence(unittest.TestCase):
+    """Snapshot + write-ahead log persistence of PositionTracker"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.positions_file = os.path.join(self.tmp_dir, 'positions.json')
+        self.wal_file = os.path.join(self.tmp_dir, 'positions.wal')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _tracker(self):
+        return PositionTracker(positions_file=self.positions_file)
+
+    def _wal_lines(self):
+        with open(self.wal_file, 'rb') as f:
+            return f.read().splitlines()
+
+    def test_replay_put_and_del(self):
+        """Puts and deletes in the log are applied on top of the snapshot"""
+        tracker = self._tracker()
+        tracker.create_position('BTCUSDT', '4h', 'LONG', 100.0, RISK_LEVELS)
+        tracker.create_position('ETHUSDT', '1d', 'SHORT', 100.0, RISK_LEVELS)
+        tracker.close_position('BTCUSDT', '4h', 'SL')
+
+        self.assertFalse(os.path.exists(self.positions_file))
+        self.assertEqual(len(self._wal_lines()), 3)
+
+        reloaded = self._tracker()
+        self.assertEqual(list(reloaded.positions), [('ETHUSDT', '1d')])
+        position = reloaded.get_position('ETHUSDT', '1d')
+        self.assertEqual(position.direction, 'SHORT')
+        self.assertEqual(position.take_profits, [105.0, 110.0, 115.0])
+
+    def test_torn_last_line_is_ignored(self):
+        """A record cut short by a crash mid-append does not break loading"""
+        tracker = self._tracker()
+        tracker.create_position('BTCUSDT', '4h', 'LONG', 100.0, RISK_LEVELS)
+        tracker._wal_fp.close()
+        tracker._wal_fp = None
+
+        with open(self.wal_file, 'ab') as f:
+            f.write(b'{"op":"put","k":"ETHUSDT_4h","v":{"sym')
+
+        reloaded = self._tracker()
+        self.assertEqual(list(reloaded.positions), [('BTCUSDT', '4h')])
+        self.assertEqual(reloaded._wal_records, 1)
+
+    def test_compacts_after_record_limit(self):
+        """Reaching WAL_COMPACT_RECORDS writes a snapshot and empties the log"""
+        tracker = self._tracker()
+        tracker.WAL_COMPACT_RECORDS = 3
+
+        tracker.create_position('BTCUSDT', '4h', 'LONG', 100.0, RISK_LEVELS)
+        tracker.create_position('ETHUSDT', '4h', 'LONG', 100.0, RISK_LEVELS)
+        self.assertFalse(os.path.exists(self.positions_file))
+        self.assertEqual(len(self._wal_lines()), 2)
+
+        tracker.create_position('SOLUSDT', '4h', 'LONG', 100.0, RISK_LEVELS)
+        self.assertTrue(os.path.exists(self.positions_file))
+        self.assertEqual(self._wal_lines(), [])
+        self.assertEqual(tracker._wal_records, 0)
+
+        reloaded = self._tracker()
+        self.assertEqual(len(reloaded.positions), 3)
+
+    def test_compacts_after_time_limit(self):
+        """A log older than WAL_COMPACT_SECONDS is compacted on the next append"""
+        tracker = self._tracker()
+        tracker.create_position('BTCUSDT', '4h', 'LONG', 100.0, RISK_LEVELS)
+        self.assertFalse(os.path.exists(self.positions_file))
+
+        tracker._last_snapshot = time.monotonic() - tracker.WAL_COMPACT_SECONDS - 1
+        tracker.create_position('ETHUSDT', '4h', 'LONG', 100.0, RISK_LEVELS)
+
+        self.assertTrue(os.path.exists(self.positions_file))
+        self.assertEqual(self._wal_lines(), [])
+        self.assertEqual(len(self._tracker().positions), 2)
+
+    def test_snapshot_is_atomic_and_truncates_log(self):
+        """Snapshot goes through an fsynced temp file and os.replace"""
+        tracker = self._tracker()
+        tracker.create_position('BTCUSDT', '4h', 'LONG', 100.0, RISK_LEVELS)
+        self.assertEqual(len(self._wal_lines()), 1)
+
+        with patch('app.services.position_tracker.os.fsync', wraps=os.fsync) as fsync, \
+                patch('app.services.position_tracker.os.replace', wraps=os.replace) as replace:
+            tracker.save_positions()
+
+        fsync.assert_called_once()
+        tmp_file, target = replace.call_args[0]
+        self.assertEqual(str(tmp_file), os.path.join(self.tmp_dir, 'positions.tmp'))
+        self.assertEqual(str(target), self.positions_file)
+        self.assertFalse(os.path.exists(tmp_file))
+        self.assertEqual(self._wal_lines(), [])
+
+        # Later records go to the fresh log and replay over the new snapshot
+        tracker.close_position('BTCUSDT', '4h', 'TP3')
+        self.assertEqual(len(self._wal_lines()), 1)
+        self.assertEqual(self._tracker().positions, {})
+
+
+class TestPositionTimestamp(unittest.TestCase):
+    """Position creation time at the JSON boundary"""
+
+    def _position(self, timestamp=None):
+        return Position('BTCUSDT', '4h', 'LONG', 100.0, 95.0, [105.0, 110.0, 115.0], timestamp)
+
+    def test_timestamp_is_utc_with_offset(self):
+        """Serialized timestamps carry an explicit UTC offset"""
+        position = self._position('2024-01-02T03:04:05.678Z')
+
+        self.assertEqual(position.timestamp, '2024-01-02T03:04:05.678000+00:00')
+
+    def test_timestamp_round_trip(self):
+        """to_dict/from_dict keep the same instant, whatever the input offset"""
+        position = self._position('2024-01-02T10:04:05+07:00')
+        restored = Position.from_dict(position.to_dict())
+
+        self.assertEqual(restored.timestamp_ms, position.timestamp_ms)
+        self.assertEqual(restored.timestamp, '2024-01-02T03:04:05+00:00')
+
+
+class TestTakeProfitOrder(unittest.TestCase):
+    """Caller TP order against the nearest-first TP scan"""
+
+    def test_caller_order_is_kept(self):
+        """Out-of-order TPs are stored as given and logged"""
+        with self.assertLogs('app.services.position_tracker', level='WARNING'):
+            position = Position('ETHUSDT', '4h', 'SHORT', 100.0, 105.0, [90.0, 95.0, 85.0])
+
+        self.assertEqual(position.take_profits, [90.0, 95.0, 85.0])
+        self.assertEqual(position._tp_order, (1, 0, 2))
+
+    def test_out_of_order_level_is_still_hit(self):
+        """A nearer TP listed after a farther one is not skipped"""
+        tracker = PositionTracker(positions_file=os.path.join(tempfile.mkdtemp(), 'positions.json'))
+        self.addCleanup(shutil.rmtree, os.path.dirname(tracker.positions_file), True)
+        tracker.create_position('ETHUSDT', '4h', 'SHORT', 100.0, {
+            'stop_loss': 105.0, 'take_profit_1': 90.0, 'take_profit_2': 95.0, 'take_profit_3': 85.0,
+        })
+
+        result = tracker.update_position_tracking('ETHUSDT', '4h', 94.0)
+
+        self.assertEqual([level['type'] for level in result['triggered_levels']], ['TP2'])
+        self.assertEqual(tracker.get_position('ETHUSDT', '4h').hit_tps, ['TP2'])
+
+
+class TestBatchUpdate(unittest.TestCase):
+    """Vectorized update_all_positions against per-position tracking"""
+
+    POSITIONS = [
+        ('BTCUSDT', '4h', 'LONG', 100.0, {'stop_loss': 95.0, 'take_profit_1': 105.0,
+                                          'take_profit_2': 110.0, 'take_profit_3': 115.0}),
+        ('ETHUSDT', '4h', 'SHORT', 2000.0, {'stop_loss': 2100.0, 'take_profit_1': 1900.0,
+                                            'take_profit_2': 1800.0, 'take_profit_3': 1700.0}),
+        ('SOLUSDT', '1d', 'LONG', 20.0, {'stop_loss': 19.0, 'take_profit_1': 21.0,
+                                         'take_profit_2': 22.0, 'take_profit_3': 23.0}),
+        ('XRPUSDT', '1d', 'SHORT', 0.5, {'stop_loss': 0.55, 'take_profit_1': 0.45,
+                                         'take_profit_2': 0.4, 'take_profit_3': 0.35}),
+    ]
+
+    # One dict per tick; symbols missing from a tick are not evaluated
+    TICKS = [
+        {'BTCUSDT': 101.0, 'ETHUSDT': 1990.0, 'SOLUSDT': 20.5, 'XRPUSDT': 0.49},
+        {'BTCUSDT': 111.0, 'ETHUSDT': 1850.0, 'XRPUSDT': 0.56},
+        {'BTCUSDT': 108.0, 'ETHUSDT': 1650.0, 'SOLUSDT': 18.5},
+        {'BTCUSDT': 116.0},
+    ]
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _tracker(self, name):
+        tracker = PositionTracker(positions_file=os.path.join(self.tmp_dir, name, 'positions.json'))
+        for symbol, timeframe, direction, entry, levels in self.POSITIONS:
+            tracker.create_position(symbol, timeframe, direction, entry, levels)
+        return tracker
+
+    def _state(self, tracker):
+        return {
+            key: (position.hit_mask, position.current_pnl, position.max_pnl, position.min_pnl)
+            for key, position in tracker.positions.items()
+        }
+
+    def test_matches_per_position_tracking(self):
+        """Batch results and position state equal one update_position_tracking per position"""
+        batch = self._tracker('batch')
+        single = self._tracker('single')
+
+        for prices in self.TICKS:
+            expected = {}
+            for key, position in list(single.positions.items()):
+                if position.symbol not in prices:
+                    continue
+                result = single.update_position_tracking(*key, prices[position.symbol])
+                if result['triggered_levels']:
+                    expected[key] = result
+
+            self.assertEqual(batch.update_all_positions(prices), expected)
+            self.assertEqual(self._state(batch), self._state(single))
+
+        # XRP and SOL closed on SL, BTC and ETH on TP3
+        self.assertEqual(batch.positions, {})
+
+    def test_untriggered_rows_only_record_pnl(self):
+        """Rows without a new level keep their TP state and are not logged"""
+        tracker = self._tracker('pnl')
+        records = tracker._wal_records
+
+        results = tracker.update_all_positions({'BTCUSDT': 102.0, 'ETHUSDT': 1950.0})
+
+        self.assertEqual(results, {})
+        self.assertEqual(tracker._wal_records, records)
+        self.assertTrue(tracker._pnl_dirty)
+        btc = tracker.get_position('BTCUSDT', '4h')
+        self.assertEqual(btc.hit_mask, 0)
+        self.assertAlmostEqual(btc.current_pnl, 2.0)
+        self.assertAlmostEqual(tracker.get_position('ETHUSDT', '4h').current_pnl, 2.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
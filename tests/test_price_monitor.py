@@ -0,0 +1,116 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest.mock import MagicMock
+
+# Fix import path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.price_monitor import PriceMonitor
+
+
+class PriceMonitorTestCase(unittest.TestCase):
+    """PriceMonitor with mocked services and a scratch checkpoint file"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.checkpoint = os.path.join(self.tmp_dir, 'monitor_state.json')
+        self.sheets_logger = MagicMock()
+        self.sheets_logger.batch_log_events.side_effect = lambda batch: len(batch)
+        self.position_manager = MagicMock()
+        self.position_manager.get_positions_summary.return_value = {"active_positions": 0}
+
+        self.monitor = PriceMonitor(
+            {"PRICE_MONITOR_INTERVAL": 0.2, "MONITOR_CHECKPOINT": self.checkpoint},
+            self.sheets_logger,
+        )
+        self.monitor.SHEETS_FLUSH_DELAY = 0.05
+        self.monitor.set_services(self.position_manager)
+
+    def tearDown(self):
+        self.monitor.shutdown()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _wait_for(self, condition, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return condition()
+
+
+class TestSheetsFlusherLifecycle(PriceMonitorTestCase):
+    """Sheets writer pool across stop/shutdown and restart"""
+
+    def _flush_one(self, level):
+        event = ("tp", {"id": "p1", "symbol": "BTCUSDT"}, {"level": level})
+        self.monitor._enqueue_sheet_event(event)
+        return self._wait_for(
+            lambda: any(call.args[0] == [event] for call in self.sheets_logger.batch_log_events.call_args_list)
+        )
+
+    def test_restart_after_shutdown(self):
+        """Events queued after shutdown() and a restart still reach Sheets"""
+        self.monitor.start_monitoring()
+        self.assertTrue(self._flush_one("TP1"))
+        self.monitor.shutdown()
+        self.assertIsNone(self.monitor._sheets_pool)
+
+        self.monitor.start_monitoring()
+        self.assertTrue(self._flush_one("TP2"))
+
+    def test_stop_keeps_pool(self):
+        """stop_monitoring() leaves the writer pool usable for the next start"""
+        self.monitor.start_monitoring()
+        pool = self.monitor._sheets_pool
+        self.monitor.stop_monitoring()
+
+        self.monitor.start_monitoring()
+        self.assertIs(self.monitor._sheets_pool, pool)
+        self.assertTrue(self._flush_one("TP1"))
+
+
+class TestCheckpoints(PriceMonitorTestCase):
+    """Periodic checkpoints written by the monitoring loop"""
+
+    def test_periodic_checkpoints_restore(self):
+        """Cycles and logged hits written by the loop are restored by a new monitor"""
+        self.position_manager.get_positions_summary.return_value = {"active_positions": 1}
+        self.position_manager.update_positions.return_value = {}
+        self.monitor.CHECKPOINT_EVERY = 1
+        self.monitor._logged_hits.add(("p1", "TP1"))
+
+        self.monitor.start_monitoring()
+        self.assertTrue(self._wait_for(lambda: os.path.exists(self.checkpoint)))
+        self.monitor.stop_monitoring()
+
+        restored = PriceMonitor({"MONITOR_CHECKPOINT": self.checkpoint})
+        self.assertGreaterEqual(restored.stats.monitoring_cycles, 1)
+        self.assertEqual(restored._logged_hits, {("p1", "TP1")})
+
+
+class TestStats(PriceMonitorTestCase):
+    """Counters shared by the loop, force checks and the sheets worker"""
+
+    def test_concurrent_increments_are_not_lost(self):
+        """Bumps from several threads all land in the one counter"""
+        threads = [
+            threading.Thread(target=lambda: [self.monitor._incr("errors") for _ in range(1000)])
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.monitor.get_stats()["errors"], 4000)
+
+        self.monitor.reset_stats()
+        self.assertEqual(self.monitor.get_stats()["errors"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,446 @@
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+import time
+from unittest.mock import patch, MagicMock
+
+# Fix import path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.scheduler import SignalScheduler
+
+
+class SchedulerTestCase(unittest.TestCase):
+    """Runs each test in a scratch directory holding data/signal_history.*"""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        self.history_file = os.path.join('data', 'signal_history.json')
+        self.log_file = os.path.join('data', 'signal_history.log')
+        self.schedulers = []
+
+    def tearDown(self):
+        for scheduler in self.schedulers:
+            scheduler._close_history_log()
+            scheduler._io_pool.shutdown(wait=True)
+            scheduler._notify_pool.shutdown(wait=True)
+            scheduler._sheets_pool.shutdown(wait=True)
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _scheduler(self):
+        scheduler = SignalScheduler({})
+        self.schedulers.append(scheduler)
+        return scheduler
+
+    def _log_lines(self):
+        with open(self.log_file, 'rb') as f:
+            return f.read().splitlines()
+
+
+class TestSignalHistoryLog(SchedulerTestCase):
+    """Snapshot + append log persistence of the signal history"""
+
+    def test_log_replays_on_top_of_snapshot(self):
+        """Records appended after the snapshot win over the snapshot values"""
+        now = time.time()
+        scheduler = self._scheduler()
+        scheduler._record_signal('BTCUSDT_4h_LONG', now=now - 600)
+        scheduler._save_signal_history()
+        scheduler._record_signal('BTCUSDT_4h_LONG', now=now - 60)
+        scheduler._record_signal('ETHUSDT_1d_SHORT', now=now - 30)
+        self.assertEqual(len(self._log_lines()), 2)
+
+        reloaded = self._scheduler()
+        self.assertEqual(reloaded.last_signals, {
+            'BTCUSDT_4h_LONG': now - 60,
+            'ETHUSDT_1d_SHORT': now - 30,
+        })
+        self.assertEqual(
+            list(reloaded._history_order),
+            [(now - 60, 'BTCUSDT_4h_LONG'), (now - 30, 'ETHUSDT_1d_SHORT')],
+        )
+        # Replayed records are folded into the next snapshot
+        self.assertTrue(reloaded._history_dirty)
+
+    def test_partial_trailing_line_is_ignored(self):
+        """A record cut short by a crash mid-append does not break loading"""
+        now = time.time()
+        scheduler = self._scheduler()
+        scheduler._record_signal('BTCUSDT_4h_LONG', now=now)
+        scheduler._close_history_log()
+
+        with open(self.log_file, 'ab') as f:
+            f.write(b'{"ETHUSDT_1d_SH')
+
+        reloaded = self._scheduler()
+        self.assertEqual(reloaded.last_signals, {'BTCUSDT_4h_LONG': now})
+        self.assertTrue(reloaded._is_duplicate_signal('BTCUSDT_4h_LONG', now=now + 1))
+
+    def test_snapshot_truncates_log(self):
+        """Writing a snapshot empties the log it now covers"""
+        now = time.time()
+        scheduler = self._scheduler()
+        scheduler._record_signal('BTCUSDT_4h_LONG', now=now)
+        scheduler._record_signal('ETHUSDT_4h_LONG', now=now)
+        self.assertEqual(len(self._log_lines()), 2)
+
+        scheduler._save_signal_history()
+
+        self.assertEqual(self._log_lines(), [])
+        self.assertFalse(scheduler._history_dirty)
+        self.assertEqual(scheduler._dirty_count, 0)
+        with open(self.history_file) as f:
+            self.assertEqual(
+                json.load(f), {'BTCUSDT_4h_LONG': now, 'ETHUSDT_4h_LONG': now}
+            )
+
+        # The open handle keeps appending to the emptied log
+        scheduler._record_signal('SOLUSDT_4h_LONG', now=now)
+        self.assertEqual(len(self._log_lines()), 1)
+        self.assertEqual(len(self._scheduler().last_signals), 3)
+
+    def test_backup_refreshed_only_by_snapshots(self):
+        """Loading leaves the backup alone; each snapshot backs up the previous one"""
+        scheduler = self._scheduler()
+        scheduler._record_signal('BTCUSDT_4h_LONG', now=time.time())
+        scheduler._save_signal_history()
+        backup_file = self.history_file + '.bak'
+        self.assertFalse(os.path.exists(backup_file))
+
+        self._scheduler()
+        self.assertFalse(os.path.exists(backup_file))
+
+        scheduler._record_signal('ETHUSDT_4h_LONG', now=time.time())
+        scheduler._save_signal_history()
+        with open(backup_file) as f:
+            self.assertEqual(list(json.load(f)), ['BTCUSDT_4h_LONG'])
+
+    def test_backup_failure_does_not_block_snapshot(self):
+        """A backup that cannot be linked is logged and the snapshot still lands"""
+        now = time.time()
+        scheduler = self._scheduler()
+        scheduler._record_signal('BTCUSDT_4h_LONG', now=now)
+        scheduler._save_signal_history()
+        scheduler._record_signal('ETHUSDT_4h_LONG', now=now)
+
+        with patch('app.services.scheduler.os.link', side_effect=OSError('not supported')), \
+                self.assertLogs('app.services.scheduler', level='WARNING'):
+            scheduler._save_signal_history()
+
+        self.assertFalse(scheduler._history_dirty)
+        self.assertEqual(self._log_lines(), [])
+        with open(self.history_file) as f:
+            self.assertEqual(len(json.load(f)), 2)
+
+    def test_corrupt_snapshot_never_replaces_backup(self):
+        """A snapshot that failed to load is not copied over the good backup"""
+        now = time.time()
+        scheduler = self._scheduler()
+        scheduler._record_signal('BTCUSDT_4h_LONG', now=now)
+        scheduler._save_signal_history()
+        scheduler._record_signal('ETHUSDT_4h_LONG', now=now)
+        scheduler._save_signal_history()
+        with open(self.history_file, 'w') as f:
+            f.write('{"BTCUSDT_4h_')
+
+        recovered = self._scheduler()
+        self.assertEqual(recovered.last_signals, {'BTCUSDT_4h_LONG': now})
+
+        recovered._record_signal('SOLUSDT_4h_LONG', now=now)
+        recovered._save_signal_history()
+        with open(self.history_file + '.bak') as f:
+            self.assertEqual(json.load(f), {'BTCUSDT_4h_LONG': now})
+
+    def test_clear_drops_logged_records(self):
+        """Cleared signals are not replayed from the log on the next load"""
+        scheduler = self._scheduler()
+        scheduler._record_signal('BTCUSDT_4h_LONG', now=time.time())
+        scheduler._record_signal('ETHUSDT_4h_LONG', now=time.time())
+
+        with patch('app.services.scheduler.os.replace', side_effect=OSError('disk full')):
+            scheduler.clear_signal_history()
+
+        self.assertEqual(scheduler.last_signals, {})
+        self.assertEqual(scheduler._dirty_count, 0)
+        self.assertEqual(self._log_lines(), [])
+        self.assertEqual(self._scheduler().last_signals, {})
+
+
+class TestClaimSignal(SchedulerTestCase):
+    """Signal claims shared through Redis with the local history as fallback"""
+
+    def setUp(self):
+        super().setUp()
+        self.scheduler = self._scheduler()
+        self.scheduler._redis = MagicMock()
+
+    def test_claimed_signal_is_recorded(self):
+        """A won SET NX claim records the signal locally"""
+        self.scheduler._redis.set.return_value = True
+
+        self.assertTrue(self.scheduler._claim_signal('BTCUSDT_4h_LONG', now=1000.0))
+
+        self.scheduler._redis.set.assert_called_once_with(
+            'sig:BTCUSDT_4h_LONG', b'1', ex=self.scheduler.cooldown_seconds, nx=True
+        )
+        self.assertEqual(self.scheduler.last_signals, {'BTCUSDT_4h_LONG': 1000.0})
+
+        # Later claims in the cooldown are answered locally
+        self.assertFalse(self.scheduler._claim_signal('BTCUSDT_4h_LONG', now=1001.0))
+        self.scheduler._redis.set.assert_called_once()
+
+    def test_lost_claim_is_not_recorded(self):
+        """A claim held by another replica leaves the local history untouched"""
+        self.scheduler._redis.set.return_value = None
+
+        self.assertFalse(self.scheduler._claim_signal('BTCUSDT_4h_LONG', now=1000.0))
+
+        self.assertEqual(self.scheduler.last_signals, {})
+        self.assertEqual(self.scheduler._dirty_count, 0)
+        self.assertFalse(os.path.exists(self.log_file))
+
+    def test_redis_down_falls_back_to_local_history(self):
+        """With Redis unreachable the local history alone dedups the signal"""
+        self.scheduler._redis.set.side_effect = ConnectionError('redis down')
+
+        self.assertTrue(self.scheduler._claim_signal('BTCUSDT_4h_LONG', now=1000.0))
+        self.assertEqual(self.scheduler.last_signals, {'BTCUSDT_4h_LONG': 1000.0})
+        self.assertFalse(self.scheduler._claim_signal('BTCUSDT_4h_LONG', now=1001.0))
+        self.assertEqual(self.scheduler._redis.set.call_count, 1)
+
+
+class TestUnfilledSignals(SchedulerTestCase):
+    """Cooldown for signals that opened no position (RECORD_UNFILLED_SIGNALS)"""
+
+    SIGNAL = {"symbol": "ETHUSDT", "signals": {"short": True}, "signal_strength": 90, "position_created": False}
+
+    def test_unfilled_signal_not_recorded_by_default(self):
+        """By default an unfilled signal stays out of the history"""
+        scheduler = self._scheduler()
+        self.assertFalse(scheduler.record_unfilled_signals)
+
+        self.assertFalse(scheduler._process_signal_refactored(self.SIGNAL, "4h", now=1000.0))
+
+        self.assertEqual(scheduler.last_signals, {})
+
+    def test_unfilled_signal_enters_cooldown_when_enabled(self):
+        """RECORD_UNFILLED_SIGNALS=true records an unfilled signal without notifying"""
+        scheduler = self._scheduler()
+        scheduler.record_unfilled_signals = True
+        scheduler.line_notifier = MagicMock()
+
+        self.assertFalse(scheduler._process_signal_refactored(self.SIGNAL, "4h", now=1000.0))
+
+        self.assertEqual(scheduler.last_signals, {"ETHUSDT_4h_SHORT": 1000.0})
+        scheduler.line_notifier.send_signal_alert.assert_not_called()
+
+
+class TestSignalAlertDelivery(SchedulerTestCase):
+    """Cooldown of a signal whose LINE alert did or did not go out"""
+
+    SIGNAL = {"symbol": "BTCUSDT", "signals": {"buy": True}, "signal_strength": 90, "position_created": True}
+
+    def setUp(self):
+        super().setUp()
+        self.scheduler = self._scheduler()
+        self.scheduler._redis = MagicMock()
+        self.scheduler._redis.set.return_value = True
+        self.scheduler.line_notifier = MagicMock()
+
+    def _process(self):
+        self.assertTrue(self.scheduler._process_signal_refactored(self.SIGNAL, "4h", now=time.time()))
+        self.scheduler._io_pool.shutdown(wait=True)
+
+    def test_delivered_alert_keeps_cooldown(self):
+        """A sent alert leaves the claim in place"""
+        self.scheduler.line_notifier.send_signal_alert.return_value = True
+
+        self._process()
+
+        self.assertIn("BTCUSDT_4h_LONG", self.scheduler.last_signals)
+        self.scheduler._redis.delete.assert_not_called()
+
+    def _assert_released(self):
+        self.assertEqual(self.scheduler.last_signals, {})
+        self.scheduler._redis.delete.assert_called_once_with("sig:BTCUSDT_4h_LONG")
+
+    def test_failed_alert_releases_cooldown(self):
+        """An alert that raised gives back the local and Redis claim"""
+        self.scheduler.line_notifier.send_signal_alert.side_effect = ConnectionError("LINE down")
+
+        self._process()
+
+        self._assert_released()
+
+    def test_undelivered_alert_releases_cooldown(self):
+        """send_signal_alert returning False counts as not delivered"""
+        self.scheduler.line_notifier.send_signal_alert.return_value = False
+
+        self._process()
+
+        self._assert_released()
+
+    def test_released_claim_stays_released_after_reload(self):
+        """The release is logged, so a restart does not restore the cooldown"""
+        self.scheduler.line_notifier.send_signal_alert.return_value = False
+
+        self._process()
+        self.scheduler._close_history_log()
+
+        self.assertEqual(self._scheduler().last_signals, {})
+
+
+class TestPositionUpdateNotifications(SchedulerTestCase):
+    """LINE delivery of one tick's position update batch"""
+
+    def setUp(self):
+        super().setUp()
+        self.scheduler = self._scheduler()
+        self.scheduler.position_manager = MagicMock()
+        self.scheduler.position_manager.get_positions_summary.return_value = {"active_positions": 2}
+        self.scheduler.position_manager.update_positions.return_value = {"p1": {}, "p2": {}}
+        self.scheduler._handle_position_update = MagicMock(
+            side_effect=lambda position_id, update_info: ({"position_id": position_id, "events": ["TP1 hit"]}, None)
+        )
+        self.scheduler.line_notifier = MagicMock()
+
+    def _run_tick(self):
+        with self.assertLogs('app.services.scheduler', level='INFO') as logs:
+            self.scheduler._update_positions_refactored()
+            self.scheduler._notify_pool.shutdown(wait=True)
+        return logs.output
+
+    def test_full_delivery_is_reported_as_sent(self):
+        """A batch delivered in full is logged as sent"""
+        self.scheduler.line_notifier.send_position_updates.return_value = 2
+
+        output = self._run_tick()
+
+        self.assertTrue(any("Sent 2 position update notifications via LINE" in line for line in output))
+        self.assertFalse(any(line.startswith("WARNING") for line in output))
+
+    def test_shortfall_is_reported_as_failure(self):
+        """Fewer updates sent than queued is a warning, not a success"""
+        self.scheduler.line_notifier.send_position_updates.return_value = 1
+
+        output = self._run_tick()
+
+        self.assertIn(
+            "WARNING:app.services.scheduler:Failed to send position update notifications: only 1 of 2 sent",
+            output,
+        )
+        self.assertFalse(any("Sent 2 position update" in line for line in output))
+
+    def test_push_error_is_reported_as_failure(self):
+        """A push error raised by the notifier is logged as a failure"""
+        self.scheduler.line_notifier.send_position_updates.side_effect = RuntimeError("push failed")
+
+        output = self._run_tick()
+
+        self.assertIn(
+            "WARNING:app.services.scheduler:Failed to send position update notifications: push failed",
+            output,
+        )
+
+
+class TestForceScan(SchedulerTestCase):
+    """Manual 1D scans against the in-flight guard"""
+
+    def setUp(self):
+        super().setUp()
+        self.scheduler = self._scheduler()
+        self.scheduler.signal_detector = MagicMock()
+        self.scheduler.signal_detector.get_active_signals.return_value = []
+
+    def test_force_scan_runs(self):
+        """An idle 1D timeframe is scanned"""
+        result = self.scheduler.force_scan_now("1d")
+
+        self.assertEqual(result["status"], "1D scan completed")
+        self.scheduler.signal_detector.get_active_signals.assert_called_once()
+
+    def test_force_scan_during_scheduled_scan(self):
+        """A 1D scan already in flight is reported instead of claimed as done"""
+        self.scheduler._scan_inflight.add("1d")
+
+        result = self.scheduler.force_scan_now("1d")
+
+        self.assertEqual(result["status"], "1D scan already in progress")
+        self.scheduler.signal_detector.get_active_signals.assert_not_called()
+
+    def test_back_to_back_scans_each_fetch(self):
+        """Scans never reuse an earlier detector result"""
+        self.scheduler.force_scan_now("1d")
+        self.scheduler.force_scan_now("1d")
+
+        self.assertEqual(self.scheduler.signal_detector.get_active_signals.call_count, 2)
+
+
+class TestExitFlush(SchedulerTestCase):
+    """Exit-time history flush tied to the running scheduler"""
+
+    def test_exit_hook_held_only_while_running(self):
+        """start_scheduler registers the flush once; stop_scheduler drops it"""
+        with patch('app.services.scheduler.atexit') as atexit:
+            scheduler = self._scheduler()
+            atexit.register.assert_not_called()
+
+            scheduler.set_services(MagicMock(), MagicMock(), None, None)
+            scheduler.start_scheduler()
+            atexit.register.assert_called_once_with(scheduler._flush_history_if_dirty)
+
+            scheduler.stop_scheduler()
+            atexit.unregister.assert_called_once_with(scheduler._flush_history_if_dirty)
+
+
+class TestSheetsWrites(SchedulerTestCase):
+    """Google Sheets writes from scans and position ticks"""
+
+    def setUp(self):
+        super().setUp()
+        self.scheduler = self._scheduler()
+        self.scheduler.position_manager = MagicMock()
+        self.scheduler.position_manager.get_positions_summary.return_value = {"active_positions": 4}
+        self.scheduler.position_manager.update_positions.return_value = {
+            f"p{i}": {"TP1_hit": {"hit": True}} for i in range(4)
+        }
+        self.scheduler.position_manager.positions = {f"p{i}": {"symbol": f"SYM{i}"} for i in range(4)}
+
+        self.calls = []
+        self.active = 0
+        self.overlapped = False
+
+        def write(kind):
+            def call(data):
+                self.active += 1
+                self.overlapped |= self.active > 1
+                time.sleep(0.01)
+                self.calls.append(kind)
+                self.active -= 1
+                return True
+            return call
+
+        self.scheduler.sheets_logger = MagicMock()
+        self.scheduler.sheets_logger.log_trading_journal.side_effect = write("journal")
+        self.scheduler.sheets_logger.log_position_update.side_effect = write("update")
+
+    def test_sheets_writes_never_overlap(self):
+        """Journal appends and row updates go through one writer, in order"""
+        signal = {"symbol": "BTCUSDT", "signals": {"buy": True}, "signal_strength": 90, "position_created": True}
+
+        self.assertTrue(self.scheduler._process_signal_refactored(signal, "4h", now=1000.0))
+        self.scheduler._update_positions_refactored()
+        self.scheduler._sheets_pool.shutdown(wait=True)
+
+        self.assertEqual(self.calls, ["journal", "update", "update", "update", "update"])
+        self.assertFalse(self.overlapped)
+
+
+if __name__ == '__main__':
+    unittest.main()
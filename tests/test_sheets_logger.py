@@ -0,0 +1,126 @@
+import unittest
+import sys
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import gspread
+
+# Fix import path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.sheets_logger import SheetsLogger
+
+HEADERS = ["Date", "Symbol", "Signal", "Entry", "SL", "TP1", "TP2", "TP3", "Win/Loss", "Win Rate"]
+
+JOURNAL = [
+    ["2024-01-01", "XRPUSDT", "LONG", "0.5", "0.45", "0.55", "0.6", "0.65", "LOSS", "0.0%"],
+    ["2024-01-02", "BTCUSDT", "LONG", "100", "95.50", "105", "110", "115", "", ""],
+    ["2024-01-02", "ETHUSDT", "SHORT", "2000", "2100.0", "1900", "1800", "1700", "", ""],
+    ["2024-01-03", "SOLUSDT", "LONG", "20", "19", "21", "22", "23", "", ""],
+]
+
+BTC = {"symbol": "BTCUSDT", "entry_price": 100.0, "close_reason": "TP3_HIT",
+       "tp_levels": {"TP1": 105.0, "TP2": 110.0, "TP3": 115.0}}
+ETH = {"symbol": "ETHUSDT", "entry_price": 2000.0}
+SOL = {"symbol": "SOLUSDT", "entry_price": 20.0, "close_reason": "MANUAL"}
+
+EVENTS = [
+    ("tp", BTC, {"target_price": 105.0, "price": 105.2}),
+    # Row is already WIN after TP1, so TP2 and the close find no match
+    ("tp", BTC, {"target_price": 110.0, "price": 110.1}),
+    ("sl", ETH, {"price": 2101.0}),
+    ("close", SOL, None),
+    ("close", BTC, None),
+]
+
+
+class _Worksheet:
+    """In-memory Trading_Journal with the gspread calls SheetsLogger uses"""
+
+    def __init__(self, rows):
+        self.grid = {}
+        for r, row in enumerate([HEADERS] + rows, start=1):
+            for c, value in enumerate(row, start=1):
+                self.grid[(r, c)] = value
+        self.rows = len(rows) + 1
+        self.writes = {}  # (row, col) -> last value written
+        self.batch_calls = 0
+
+    def get_all_records(self, numericise_ignore=()):
+        records = []
+        for r in range(2, self.rows + 1):
+            record = {}
+            for c, header in enumerate(HEADERS, start=1):
+                value = self.grid[(r, c)]
+                record[header] = value if "all" in numericise_ignore else gspread.utils.numericise(value)
+            records.append(record)
+        return records
+
+    def cell(self, row, col):
+        return SimpleNamespace(value=self.grid[(row, col)])
+
+    def update_cell(self, row, col, value):
+        self.grid[(row, col)] = value
+        self.writes[(row, col)] = value
+
+    def batch_update(self, data, value_input_option=None):
+        self.batch_calls += 1
+        for entry in data:
+            self.update_cell(*gspread.utils.a1_to_rowcol(entry["range"]), entry["values"][0][0])
+
+
+class TestBatchLogEvents(unittest.TestCase):
+    """batch_log_events against the per-event log_* path"""
+
+    def _logger(self, worksheet):
+        sheets_logger = SheetsLogger.__new__(SheetsLogger)
+        sheets_logger._initialized = True
+        sheets_logger.spreadsheet = MagicMock()
+        sheets_logger._cached_worksheet = worksheet
+        return sheets_logger
+
+    def test_batch_writes_same_cells_as_individual_calls(self):
+        """TP/SL marks, Win/Loss and Win Rate match the one-call-per-event path"""
+        single = _Worksheet(JOURNAL)
+        sheets_logger = self._logger(single)
+        for kind, position_data, info in EVENTS:
+            if kind == "tp":
+                sheets_logger.log_tp_hit(position_data, info)
+            elif kind == "sl":
+                sheets_logger.log_sl_hit(position_data, info)
+            else:
+                sheets_logger.log_position_close(position_data)
+
+        batched = _Worksheet(JOURNAL)
+        applied = self._logger(batched).batch_log_events(EVENTS)
+
+        self.assertEqual(applied, 3)
+        self.assertEqual(batched.batch_calls, 1)
+        self.assertEqual(batched.writes, single.writes)
+        self.assertEqual(batched.grid, single.grid)
+        self.assertEqual(batched.writes, {
+            (3, 6): "✅ 105",
+            (3, 9): "WIN",
+            (3, 10): "50.0%",
+            (4, 5): "❌ 2100.0",
+            (4, 9): "LOSS",
+            (4, 10): "33.3%",
+            (5, 9): "MANUAL_CLOSE",
+            (5, 10): "33.3%",
+        })
+
+    def test_unmatched_events_write_nothing(self):
+        """Events on settled rows leave the sheet untouched"""
+        worksheet = _Worksheet(JOURNAL)
+        applied = self._logger(worksheet).batch_log_events([
+            ("sl", {"symbol": "XRPUSDT", "entry_price": 0.5}, {"price": 0.44}),
+        ])
+
+        self.assertEqual(applied, 0)
+        self.assertEqual(worksheet.batch_calls, 0)
+        self.assertEqual(worksheet.writes, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
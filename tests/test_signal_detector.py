@@ -0,0 +1,110 @@
+import unittest
+import sys
+import os
+import time
+from unittest.mock import patch, MagicMock
+
+import requests
+
+# Fix import path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.data_manager import DataManager
+from app.services.signal_detector import SignalDetector
+
+
+def _kline_rows(count=100):
+    """Binance-style kline rows"""
+    start = 1700000000000
+    return [
+        [start + i * 3600000, "1", "2", "0.5", "1.5", "10", 0, 0, 0, 0, 0, 0]
+        for i in range(count)
+    ]
+
+
+class _Response:
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self._data = data
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            error = requests.exceptions.HTTPError(f"{self.status_code} error")
+            error.response = self
+            raise error
+
+    def json(self):
+        return self._data
+
+
+class TestKlinePrefetch(unittest.TestCase):
+    """Concurrent kline prefetch in SignalDetector.scan_multiple_symbols"""
+
+    def setUp(self):
+        self.env_patcher = patch.dict(os.environ, {
+            'LINE_CHANNEL_ACCESS_TOKEN': 'test_line_token_' + 'x' * 50,
+            'LINE_CHANNEL_SECRET': 'test_line_secret_12345',
+            'LINE_USER_ID': 'test_user',
+        })
+        self.env_patcher.start()
+
+        self.data_manager = DataManager()
+        self.data_manager._save_to_file = MagicMock()
+        self.data_manager._load_from_file = MagicMock(return_value=None)
+        self.data_manager.session = MagicMock()
+
+        self.detector = SignalDetector.__new__(SignalDetector)
+        self.detector.data_manager = self.data_manager
+
+    def tearDown(self):
+        self.env_patcher.stop()
+
+    def test_prefetch_returns_cached_pairs(self):
+        """Every symbol/timeframe plus the 1D trend series is cached and reported"""
+        self.data_manager.session.get.return_value = _Response(200, _kline_rows())
+
+        cached = self.detector._prefetch_klines(["BTCUSDT", "ETHUSDT"], ["4h"])
+
+        self.assertEqual(cached, {
+            ("BTCUSDT", "4h"), ("BTCUSDT", "1d"),
+            ("ETHUSDT", "4h"), ("ETHUSDT", "1d"),
+        })
+
+    def test_prefetch_backs_off_on_ban(self):
+        """A 418 starts the back-off window and failed pairs are not reported"""
+        def fake_get(url, params=None, timeout=None):
+            if params["symbol"] == "BANNED":
+                return _Response(418, headers={"Retry-After": "120"})
+            time.sleep(0.05)
+            return _Response(200, _kline_rows())
+
+        self.data_manager.session.get.side_effect = fake_get
+        symbols = ["BANNED"] + [f"SYM{i}USDT" for i in range(10)]
+
+        cached = self.detector._prefetch_klines(symbols, ["4h"])
+
+        self.assertTrue(self.data_manager.is_rate_limited())
+        self.assertNotIn(("BANNED", "4h"), cached)
+        self.assertLess(len(cached), 2 * len(symbols))
+        # No further network requests while banned
+        calls = self.data_manager.session.get.call_count
+        self.data_manager.get_klines("OTHERUSDT", "4h", limit=100)
+        self.assertEqual(self.data_manager.session.get.call_count, calls)
+
+    def test_scan_spaces_only_uncached_series(self):
+        """The 0.2s spacing is skipped only for series the prefetch cached"""
+        self.detector._prefetch_klines = MagicMock(return_value={
+            ("BTCUSDT", "4h"), ("BTCUSDT", "1d"), ("ETHUSDT", "4h"),
+        })
+        self.detector.analyze_symbol = MagicMock(return_value=None)
+
+        with patch("app.services.signal_detector.time.sleep") as sleep:
+            self.detector.scan_multiple_symbols(["BTCUSDT", "ETHUSDT"], ["4h"])
+
+        # ETHUSDT's 1D trend was not cached, so only its scan is spaced
+        sleep.assert_called_once_with(0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()